@@ -5,6 +5,7 @@ bb - A function pool manager for Python code
 import ast
 import argparse
 import builtins
+import functools
 import hashlib
 import itertools
 import json
@@ -13,6 +14,7 @@ import subprocess
 import sys
 import sqlite3
 import struct
+import threading
 import time
 import uuid
 from collections import namedtuple
@@ -21,8 +23,9 @@ from pathlib import Path
 from typing import Dict, Set, Tuple, List, Union, Any, Generator, Callable, Optional
 
 
-# Get all Python built-in names
-PYTHON_BUILTINS = set(dir(builtins))
+# Get all Python built-in names. Frozen: the set is never mutated and
+# frozenset membership tests are marginally faster
+PYTHON_BUILTINS = frozenset(dir(builtins))
 
 # Prefix for bb.pool imports to ensure valid Python identifiers
 # SHA256 hashes can start with digits (0-9), which are invalid as Python identifiers
@@ -52,6 +55,124 @@ _ENCODE_FALSE = 0x09
 _ENCODE_UUID = 0x0A
 _ENCODE_BBH = 0x0B
 
+# Precompiled structs: skips the per-call format parse of struct.pack,
+# and unpack_from reads straight out of the buffer with no slice copy
+_STRUCT_UINT64 = struct.Struct('>Q')
+_STRUCT_DOUBLE = struct.Struct('>d')
+
+
+def _bytes_write_none(buf: bytearray, value: None, nested: bool) -> None:
+    if nested:
+        buf += b'\x00\xff'
+    else:
+        buf.append(_ENCODE_NULL)
+
+
+def _bytes_write_bool(buf: bytearray, value: bool, nested: bool) -> None:
+    buf.append(_ENCODE_TRUE if value else _ENCODE_FALSE)
+
+
+def _bytes_write_bytes(buf: bytearray, value: bytes, nested: bool) -> None:
+    buf.append(_ENCODE_BYTES)
+    # One C-level pass for null escaping
+    buf += value.replace(b'\x00', b'\x00\xFF')
+    buf.append(0x00)
+
+
+def _bytes_write_str(buf: bytearray, value: str, nested: bool) -> None:
+    buf.append(_ENCODE_STRING)
+    buf += value.encode('utf-8').replace(b'\x00', b'\x00\xFF')
+    buf.append(0x00)
+
+
+def _bytes_write_int(buf: bytearray, value: int, nested: bool) -> None:
+    if value == 0:
+        buf.append(_ENCODE_INT_ZERO)
+    elif value > 0:
+        buf.append(_ENCODE_INT_POS)
+        buf += value.to_bytes(8, 'big')
+    else:
+        buf.append(_ENCODE_INT_NEG)
+        buf += ((1 << 64) - 1 + value).to_bytes(8, 'big')
+
+
+def _bytes_write_float(buf: bytearray, value: float, nested: bool) -> None:
+    # 0.0 compares equal to 0 and has always been encoded as the integer
+    # zero marker; keep that for byte compatibility with existing data
+    if value == 0:
+        buf.append(_ENCODE_INT_ZERO)
+        return
+    bits = _STRUCT_UINT64.unpack(_STRUCT_DOUBLE.pack(value))[0]
+    # Flip sign bit, or flip all bits if negative: one integer xor
+    # instead of a per-byte Python loop
+    if bits >> 63:
+        bits ^= 0xFFFFFFFFFFFFFFFF
+    else:
+        bits ^= 1 << 63
+    buf.append(_ENCODE_FLOAT)
+    buf += bits.to_bytes(8, 'big')
+
+
+def _bytes_write_uuid(buf: bytearray, value: uuid.UUID, nested: bool) -> None:
+    # UUIDs are stored as 16 bytes (128 bits)
+    # UUID.bytes maintains lexicographic ordering for ULIDs
+    buf.append(_ENCODE_UUID)
+    buf += value.bytes
+
+
+def _bytes_write_bbh(buf: bytearray, value: 'BBH', nested: bool) -> None:
+    # BBH stores a SHA256 hash (32 bytes)
+    # value can be bytes or hex string
+    if isinstance(value.value, bytes):
+        if len(value.value) != 32:
+            raise ValueError(f"BBH bytes must be exactly 32 bytes, got {len(value.value)}")
+        buf.append(_ENCODE_BBH)
+        buf += value.value
+    elif isinstance(value.value, str):
+        if len(value.value) != 64:
+            raise ValueError(f"BBH hex string must be exactly 64 characters, got {len(value.value)}")
+        buf.append(_ENCODE_BBH)
+        buf += bytes.fromhex(value.value)
+    else:
+        raise ValueError(f"BBH value must be bytes or hex string, got {type(value.value)}")
+
+
+def _bytes_write_nested(buf: bytearray, value: Any, nested: bool) -> None:
+    buf.append(_ENCODE_NESTED)
+    for item in value:
+        _bytes_write_into(buf, item, True)
+    buf.append(0x00)
+
+
+# Writer dispatch keyed on exact type: one dict lookup instead of an
+# isinstance chain per value. BBH subclasses tuple, so the exact-type
+# entry keeps it off the nested path.
+_BYTES_WRITERS = {
+    type(None): _bytes_write_none,
+    bool: _bytes_write_bool,
+    bytes: _bytes_write_bytes,
+    str: _bytes_write_str,
+    int: _bytes_write_int,
+    float: _bytes_write_float,
+    uuid.UUID: _bytes_write_uuid,
+    BBH: _bytes_write_bbh,
+    tuple: _bytes_write_nested,
+    list: _bytes_write_nested,
+}
+
+
+def _bytes_write_into(buf: bytearray, value: Any, nested: bool) -> None:
+    """Append the encoding of a single value to buf."""
+    writer = _BYTES_WRITERS.get(type(value))
+    if writer is None:
+        # Subclasses (e.g. namedtuples other than BBH) miss the exact-type
+        # table; fall back to the sequence writer where it applies
+        if isinstance(value, (tuple, list)):
+            writer = _bytes_write_nested
+        else:
+            raise ValueError(f"Unsupported type for encoding: {type(value)}")
+    writer(buf, value, nested)
+
 
 def bytes_write_one(value: Any, nested: bool = False) -> bytes:
     """Encode a single value to bytes with order preservation.
@@ -63,50 +184,109 @@ def bytes_write_one(value: Any, nested: bool = False) -> bytes:
     Returns:
         Encoded bytes
     """
-    if value is None:
-        return bytes([_ENCODE_NULL, 0xFF] if nested else [_ENCODE_NULL])
-    elif isinstance(value, bool):
-        return bytes([_ENCODE_TRUE if value else _ENCODE_FALSE])
-    elif isinstance(value, bytes):
-        return bytes([_ENCODE_BYTES]) + value.replace(b'\x00', b'\x00\xFF') + b'\x00'
-    elif isinstance(value, str):
-        return bytes([_ENCODE_STRING]) + value.encode('utf-8').replace(b'\x00', b'\x00\xFF') + b'\x00'
-    elif value == 0:
-        return bytes([_ENCODE_INT_ZERO])
-    elif isinstance(value, int):
-        if value > 0:
-            return bytes([_ENCODE_INT_POS]) + struct.pack('>Q', value)
-        else:
-            return bytes([_ENCODE_INT_NEG]) + struct.pack('>Q', (1 << 64) - 1 + value)
-    elif isinstance(value, float):
-        bits = struct.pack('>d', value)
-        # Flip sign bit, or flip all bits if negative
-        if bits[0] & 0x80:
-            bits = bytes(b ^ 0xFF for b in bits)
-        else:
-            bits = bytes([bits[0] ^ 0x80]) + bits[1:]
-        return bytes([_ENCODE_FLOAT]) + bits
-    elif isinstance(value, uuid.UUID):
-        # UUIDs are stored as 16 bytes (128 bits)
-        # UUID.bytes maintains lexicographic ordering for ULIDs
-        return bytes([_ENCODE_UUID]) + value.bytes
-    elif isinstance(value, BBH):
-        # BBH stores a SHA256 hash (32 bytes)
-        # value can be bytes or hex string
-        if isinstance(value.value, bytes):
-            if len(value.value) != 32:
-                raise ValueError(f"BBH bytes must be exactly 32 bytes, got {len(value.value)}")
-            return bytes([_ENCODE_BBH]) + value.value
-        elif isinstance(value.value, str):
-            if len(value.value) != 64:
-                raise ValueError(f"BBH hex string must be exactly 64 characters, got {len(value.value)}")
-            return bytes([_ENCODE_BBH]) + bytes.fromhex(value.value)
-        else:
-            raise ValueError(f"BBH value must be bytes or hex string, got {type(value.value)}")
-    elif isinstance(value, (tuple, list)):
-        return bytes([_ENCODE_NESTED]) + b''.join(bytes_write_one(v, True) for v in value) + bytes([0x00])
+    buf = bytearray()
+    _bytes_write_into(buf, value, nested)
+    return bytes(buf)
+
+
+def _bytes_read_terminator(data: bytes, pos: int) -> int:
+    """Find the unescaped null terminator starting at pos.
+
+    Uses C-level bytes.find, skipping escaped nulls (0x00 0xFF pairs),
+    instead of walking byte by byte in Python.
+    """
+    end = data.find(b'\x00', pos)
+    while end != -1 and end + 1 < len(data) and data[end + 1] == 0xFF:
+        end = data.find(b'\x00', end + 2)
+    return len(data) if end == -1 else end
+
+
+def _bytes_read_null(data: bytes, pos: int) -> Tuple[Any, int]:
+    return (None, pos)
+
+
+def _bytes_read_bytes(data: bytes, pos: int) -> Tuple[Any, int]:
+    end = _bytes_read_terminator(data, pos)
+    return (data[pos:end].replace(b'\x00\xFF', b'\x00'), end + 1)
+
+
+def _bytes_read_str(data: bytes, pos: int) -> Tuple[Any, int]:
+    end = _bytes_read_terminator(data, pos)
+    return (data[pos:end].replace(b'\x00\xFF', b'\x00').decode('utf-8'), end + 1)
+
+
+def _bytes_read_int_zero(data: bytes, pos: int) -> Tuple[Any, int]:
+    return (0, pos)
+
+
+def _bytes_read_int_pos(data: bytes, pos: int) -> Tuple[Any, int]:
+    return (_STRUCT_UINT64.unpack_from(data, pos)[0], pos + 8)
+
+
+def _bytes_read_int_neg(data: bytes, pos: int) -> Tuple[Any, int]:
+    val = _STRUCT_UINT64.unpack_from(data, pos)[0]
+    return (val - ((1 << 64) - 1), pos + 8)
+
+
+def _bytes_read_float(data: bytes, pos: int) -> Tuple[Any, int]:
+    bits = _STRUCT_UINT64.unpack_from(data, pos)[0]
+    if bits >> 63:
+        bits ^= 1 << 63
     else:
-        raise ValueError(f"Unsupported type for encoding: {type(value)}")
+        bits ^= 0xFFFFFFFFFFFFFFFF
+    value = _STRUCT_DOUBLE.unpack(bits.to_bytes(8, 'big'))[0]
+    return (value, pos + 8)
+
+
+def _bytes_read_true(data: bytes, pos: int) -> Tuple[Any, int]:
+    return (True, pos)
+
+
+def _bytes_read_false(data: bytes, pos: int) -> Tuple[Any, int]:
+    return (False, pos)
+
+
+def _bytes_read_uuid(data: bytes, pos: int) -> Tuple[Any, int]:
+    # UUIDs are stored as 16 bytes (128 bits)
+    return (uuid.UUID(bytes=data[pos:pos + 16]), pos + 16)
+
+
+def _bytes_read_bbh(data: bytes, pos: int) -> Tuple[Any, int]:
+    # BBH stores a SHA256 hash (32 bytes)
+    # Return as hex string for easier use
+    return (BBH(data[pos:pos + 32].hex()), pos + 32)
+
+
+def _bytes_read_nested(data: bytes, pos: int) -> Tuple[Any, int]:
+    result = []
+    while pos < len(data):
+        if data[pos] == 0x00:
+            if pos + 1 < len(data) and data[pos + 1] == 0xFF:
+                result.append(None)
+                pos += 2
+            else:
+                break
+        else:
+            val, pos = bytes_read_one(data, pos)
+            result.append(val)
+    return (tuple(result), pos + 1)
+
+
+# Reader jump table indexed by the leading type-code byte: one list
+# index per value instead of an if/elif chain over the codes
+_BYTES_READERS = [None] * 256
+_BYTES_READERS[_ENCODE_NULL] = _bytes_read_null
+_BYTES_READERS[_ENCODE_BYTES] = _bytes_read_bytes
+_BYTES_READERS[_ENCODE_STRING] = _bytes_read_str
+_BYTES_READERS[_ENCODE_NESTED] = _bytes_read_nested
+_BYTES_READERS[_ENCODE_INT_ZERO] = _bytes_read_int_zero
+_BYTES_READERS[_ENCODE_INT_POS] = _bytes_read_int_pos
+_BYTES_READERS[_ENCODE_INT_NEG] = _bytes_read_int_neg
+_BYTES_READERS[_ENCODE_FLOAT] = _bytes_read_float
+_BYTES_READERS[_ENCODE_TRUE] = _bytes_read_true
+_BYTES_READERS[_ENCODE_FALSE] = _bytes_read_false
+_BYTES_READERS[_ENCODE_UUID] = _bytes_read_uuid
+_BYTES_READERS[_ENCODE_BBH] = _bytes_read_bbh
 
 
 def bytes_read_one(data: bytes, pos: int = 0) -> Tuple[Any, int]:
@@ -120,64 +300,18 @@ def bytes_read_one(data: bytes, pos: int = 0) -> Tuple[Any, int]:
         Tuple of (decoded_value, next_position)
     """
     code = data[pos]
-    if code == _ENCODE_NULL:
-        return (None, pos + 1)
-    elif code == _ENCODE_BYTES:
-        end = pos + 1
-        while end < len(data):
-            if data[end] == 0x00 and (end + 1 >= len(data) or data[end + 1] != 0xFF):
-                break
-            end += 1 if data[end] != 0x00 else 2
-        return (data[pos + 1:end].replace(b'\x00\xFF', b'\x00'), end + 1)
-    elif code == _ENCODE_STRING:
-        end = pos + 1
-        while end < len(data):
-            if data[end] == 0x00 and (end + 1 >= len(data) or data[end + 1] != 0xFF):
-                break
-            end += 1 if data[end] != 0x00 else 2
-        return (data[pos + 1:end].replace(b'\x00\xFF', b'\x00').decode('utf-8'), end + 1)
-    elif code == _ENCODE_INT_ZERO:
-        return (0, pos + 1)
-    elif code == _ENCODE_INT_POS:
-        return (struct.unpack('>Q', data[pos + 1:pos + 9])[0], pos + 9)
-    elif code == _ENCODE_INT_NEG:
-        val = struct.unpack('>Q', data[pos + 1:pos + 9])[0]
-        return (val - ((1 << 64) - 1), pos + 9)
-    elif code == _ENCODE_FLOAT:
-        bits = bytearray(data[pos + 1:pos + 9])
-        if bits[0] & 0x80:
-            bits[0] ^= 0x80
-        else:
-            bits = bytes(b ^ 0xFF for b in bits)
-        return (struct.unpack('>d', bytes(bits))[0], pos + 9)
-    elif code == _ENCODE_TRUE:
-        return (True, pos + 1)
-    elif code == _ENCODE_FALSE:
-        return (False, pos + 1)
-    elif code == _ENCODE_UUID:
-        # UUIDs are stored as 16 bytes (128 bits)
-        return (uuid.UUID(bytes=data[pos + 1:pos + 17]), pos + 17)
-    elif code == _ENCODE_BBH:
-        # BBH stores a SHA256 hash (32 bytes)
-        # Return as hex string for easier use
-        hash_bytes = data[pos + 1:pos + 33]
-        return (BBH(hash_bytes.hex()), pos + 33)
-    elif code == _ENCODE_NESTED:
-        result = []
-        pos += 1
-        while pos < len(data):
-            if data[pos] == 0x00:
-                if pos + 1 < len(data) and data[pos + 1] == 0xFF:
-                    result.append(None)
-                    pos += 2
-                else:
-                    break
-            else:
-                val, pos = bytes_read_one(data, pos)
-                result.append(val)
-        return (tuple(result), pos + 1)
-    else:
+    reader = _BYTES_READERS[code]
+    if reader is None:
         raise ValueError(f"Unknown encode type code: {code}")
+    return reader(data, pos + 1)
+
+
+# Thread-local scratch buffer for bytes_write: keys are built on every
+# database operation, so reuse one bytearray object per thread instead
+# of allocating a fresh one per call. Thread-local rather than global
+# because bytes_write runs in worker threads during parallel aston
+# writes.
+_BYTES_SCRATCH = threading.local()
 
 
 def bytes_write(items: Tuple) -> bytes:
@@ -189,7 +323,13 @@ def bytes_write(items: Tuple) -> bytes:
     Returns:
         Encoded bytes that preserve lexicographic order
     """
-    return b''.join(bytes_write_one(item) for item in items)
+    buf = getattr(_BYTES_SCRATCH, 'buf', None)
+    if buf is None:
+        buf = _BYTES_SCRATCH.buf = bytearray()
+    buf.clear()
+    for item in items:
+        _bytes_write_into(buf, item, False)
+    return bytes(buf)
 
 
 def bytes_read(data: bytes) -> Tuple:
@@ -295,14 +435,32 @@ def db_open(path: str) -> sqlite3.Connection:
     Returns:
         SQLite connection
     """
-    conn = sqlite3.Connection(path)
+    # Each db_* helper reuses a handful of fixed SQL strings, so a
+    # larger statement cache lets sqlite skip re-preparing them; 256
+    # comfortably covers every variant the helpers can generate.
+    conn = sqlite3.Connection(path, cached_statements=256)
+    # page_size only takes effect on a fresh database, so it must run
+    # before the first table is created; the rest tune journaling and
+    # caching: WAL appends instead of rollback-journal fsyncs,
+    # synchronous=NORMAL drops the per-commit fsync WAL makes redundant,
+    # and busy_timeout avoids immediate 'database is locked' errors.
+    # All are harmless no-ops for :memory: databases.
+    conn.execute('PRAGMA page_size=8192')
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-64000')
+    conn.execute('PRAGMA mmap_size=268435456')
+    conn.execute('PRAGMA busy_timeout=5000')
+    # The BLOB PRIMARY KEY already creates the index that backs every
+    # key lookup and range scan, so no separate index is needed; a
+    # second index on the same column would only double write cost.
     conn.execute('''
         CREATE TABLE IF NOT EXISTS kv (
             key BLOB PRIMARY KEY,
             value BLOB NOT NULL
         )
     ''')
-    conn.execute('CREATE INDEX IF NOT EXISTS idx_key ON kv(key)')
     conn.commit()
     return conn
 
@@ -313,6 +471,9 @@ def db_close(conn: sqlite3.Connection) -> None:
     Args:
         conn: SQLite connection
     """
+    # Refresh stale query-planner statistics before closing; usually a
+    # no-op, but runs a targeted ANALYZE when it would improve plans.
+    conn.execute('PRAGMA optimize')
     conn.close()
 
 
@@ -480,72 +641,303 @@ def db_count(conn: sqlite3.Connection, key: bytes, other: bytes, offset: int = 0
 # - index: Position in array (int), None for scalars, -1 for empty lists
 # - value: Atomic data (None/str/int/float/bool) or hash reference (64-char hex)
 
+# Hash constructor hoisted to module level: aston_write hashes one small
+# message per AST node, so the global attribute lookup is on the hot path
+_sha256 = hashlib.sha256
+
+
+def _blake2b_256(data: bytes):
+    """BLAKE2b truncated to 256 bits: same 64-hex-char output width as
+    SHA-256 but cheaper on short messages. Alternative content hash for
+    aston_write; SHA-256 remains the default for compatibility."""
+    return hashlib.blake2b(data, digest_size=32)
 
-def aston_write(node: ast.AST) -> Tuple[str, List[Tuple]]:
+
+# Supported content-hash algorithms for ASTON
+_ASTON_HASHERS = {'sha256': _sha256, 'blake2b': _blake2b_256}
+
+# JSON string escaper (C-accelerated when available, ensure_ascii=False flavor)
+_json_escape = json.encoder.encode_basestring
+
+
+def _aston_scalar(value: Any) -> str:
+    """Encode a scalar the way json.dumps(ensure_ascii=False) would.
+
+    Only the types that can appear in an ASTON object are handled:
+    None, bool, str, int and float.
+    """
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    cls = value.__class__
+    if cls is str:
+        return _json_escape(value)
+    if cls is int:
+        return repr(value)
+    if cls is float:
+        # Match json.dumps rendering of non-finite floats
+        if value != value:
+            return 'NaN'
+        if value == float('inf'):
+            return 'Infinity'
+        if value == float('-inf'):
+            return '-Infinity'
+        return repr(value)
+    raise ValueError(f"Unsupported scalar type for ASTON encoding: {type(value)}")
+
+
+def _aston_canonical_encode(obj: Dict[str, Any]) -> bytes:
+    """Encode an ASTON node object to canonical JSON bytes.
+
+    Produces output byte-identical to
+    json.dumps(obj, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    for the bounded shape of ASTON objects: a flat dict whose keys are AST
+    field names and whose values are scalars or lists of scalars. Emitting
+    the bytes directly avoids the generic encoder's per-node dispatch and
+    key-sort allocation, which dominates aston_write on large trees.
+    """
+    parts = ['{']
+    first = True
+    for key in sorted(obj):
+        if first:
+            first = False
+        else:
+            parts.append(', ')
+        parts.append(_json_escape(key))
+        parts.append(': ')
+        value = obj[key]
+        if value.__class__ is list:
+            parts.append('[')
+            parts.append(', '.join(map(_aston_scalar, value)))
+            parts.append(']')
+        else:
+            parts.append(_aston_scalar(value))
+    parts.append('}')
+    return ''.join(parts).encode('utf-8')
+
+
+# Per-class cache of (fields, class name) for aston_write: _fields is
+# immutable per AST node class, so resolve it once per class instead of
+# per node
+_ASTON_FIELDS_CACHE: Dict[type, Tuple[Tuple[str, ...], str]] = {}
+
+
+# Hash-cons cache for aston_write: keyed on the structural signature of a
+# node (class name plus field data, child fields already reduced to their
+# content hashes). Syntactically identical subtrees -- the many Load/Store
+# contexts, repeated Name and Constant nodes -- hash to the same content
+# hash and emit the same tuples, so recurrences skip serialization and
+# hashing entirely. Cleared per command_aston invocation.
+_ASTON_CONS_CACHE: Dict[tuple, Tuple[str, List[Tuple]]] = {}
+
+
+def aston_write(node: ast.AST, algorithm: str = 'sha256') -> Tuple[str, List[Tuple]]:
     """Convert an AST node to ASTON tuples.
 
     Args:
         node: AST node to convert
+        algorithm: Content-hash algorithm ('sha256' or 'blake2b')
 
     Returns:
         (content_hash, all_tuples) where:
         - content_hash: SHA256 hex digest of the canonical JSON representation
         - all_tuples: List of (content_hash, key, index, value) tuples for this node and all descendants
+
+    The traversal is an explicit-stack post-order walk rather than a
+    recursive one: tuples accumulate in a single shared list and no Python
+    frame is created per AST node, which matters for deep or large trees.
     """
+    hasher = _ASTON_HASHERS.get(algorithm)
+    if hasher is None:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+
     all_tuples = []
-    obj = {'__class__.__name__': node.__class__.__name__}
-
-    # Process all fields and build obj for hashing
-    field_data = {}
-
-    for field, value in ast.iter_fields(node):
-        if value is None:
-            obj[field] = None
-            field_data[field] = ('scalar', None)
-        elif isinstance(value, (str, int, float, bool)):
-            obj[field] = value
-            field_data[field] = ('scalar', value)
-        elif isinstance(value, list):
-            obj[field] = []
-            list_items = []
-            for item in value:
-                if isinstance(item, ast.AST):
-                    child_hash, child_tuples = aston_write(item)
-                    all_tuples.extend(child_tuples)
-                    obj[field].append(child_hash)
-                    list_items.append(child_hash)
+    hashes: Dict[int, str] = {}  # id(node) -> content_hash, filled post-order
+
+    # Bind hot callables to locals: the loop below runs once or twice per
+    # AST node and every global/attribute lookup shows up on large trees
+    tuples_extend = all_tuples.extend
+    cache_get = _ASTON_CONS_CACHE.get
+    fields_cache_get = _ASTON_FIELDS_CACHE.get
+    is_instance = isinstance
+    ast_AST = ast.AST
+
+    # Each stack entry is (node, visited): nodes are pushed unvisited, their
+    # AST children are pushed above them, and the node is processed once it
+    # is popped a second time (all children hashes are then available).
+    stack = [(node, False)]
+    stack_pop = stack.pop
+    stack_append = stack.append
+    while stack:
+        current, visited = stack_pop()
+        cls = current.__class__
+        layout = fields_cache_get(cls)
+        if layout is None:
+            layout = _ASTON_FIELDS_CACHE[cls] = (cls._fields, cls.__name__)
+        fields, class_name = layout
+        if not visited:
+            stack_append((current, True))
+            # Push children in reverse field order so they pop left-to-right
+            children = []
+            for field in fields:
+                try:
+                    value = getattr(current, field)
+                except AttributeError:
+                    continue
+                if is_instance(value, ast_AST):
+                    children.append(value)
+                elif value.__class__ is list:
+                    for item in value:
+                        if is_instance(item, ast_AST):
+                            children.append(item)
+            while children:
+                stack_append((children.pop(), False))
+            continue
+
+        obj = {'__class__.__name__': class_name}
+
+        # Process all fields and build obj for hashing
+        field_data = {}
+
+        for field in fields:
+            try:
+                value = getattr(current, field)
+            except AttributeError:
+                continue
+            if value is None:
+                obj[field] = None
+                field_data[field] = ('scalar', None)
+            elif is_instance(value, (str, int, float, bool)):
+                obj[field] = value
+                field_data[field] = ('scalar', value)
+            elif value.__class__ is list:
+                list_items = []
+                for item in value:
+                    if is_instance(item, ast_AST):
+                        list_items.append(hashes[id(item)])
+                    else:
+                        list_items.append(item)
+                obj[field] = list_items
+                # Mark empty lists explicitly
+                if not list_items:
+                    field_data[field] = ('empty_list', None)
                 else:
-                    obj[field].append(item)
-                    list_items.append(item)
-            # Mark empty lists explicitly
-            if not list_items:
-                field_data[field] = ('empty_list', None)
-            else:
-                field_data[field] = ('list', list_items)
-        elif isinstance(value, ast.AST):
-            child_hash, child_tuples = aston_write(value)
-            all_tuples.extend(child_tuples)
-            obj[field] = child_hash
-            field_data[field] = ('scalar', child_hash)
-
-    # Compute content hash from canonical JSON representation
-    canonical = json.dumps(obj, sort_keys=True, ensure_ascii=False)
-    content_hash = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
-
-    # Create tuples for this node
-    node_tuples = [(content_hash, '__class__.__name__', None, node.__class__.__name__)]
-
-    for field, (kind, data) in field_data.items():
-        if kind == 'scalar':
-            node_tuples.append((content_hash, field, None, data))
-        elif kind == 'empty_list':
-            # Use index -1 to mark empty list
-            node_tuples.append((content_hash, field, -1, None))
-        elif kind == 'list':
-            for i, item_value in enumerate(data):
-                node_tuples.append((content_hash, field, i, item_value))
-
-    all_tuples.extend(node_tuples)
+                    field_data[field] = ('list', list_items)
+            elif is_instance(value, ast_AST):
+                child_hash = hashes[id(value)]
+                obj[field] = child_hash
+                field_data[field] = ('scalar', child_hash)
+
+        # Hash-cons lookup: child fields are already reduced to content
+        # hashes, so the signature is cheap to build. Scalars are tagged with
+        # their class name to keep e.g. Constant(True) and Constant(1) distinct.
+        signature = (algorithm, class_name, tuple(
+            (field, kind, tuple((v.__class__.__name__, v) for v in data))
+            if kind == 'list' else (field, kind, data.__class__.__name__, data)
+            for field, (kind, data) in field_data.items()
+        ))
+        cached = cache_get(signature)
+        if cached is not None:
+            content_hash, node_tuples = cached
+        else:
+            # Compute content hash from canonical JSON representation
+            content_hash = hasher(_aston_canonical_encode(obj)).hexdigest()
+
+            # Create tuples for this node
+            node_tuples = [(content_hash, '__class__.__name__', None, class_name)]
+
+            for field, (kind, data) in field_data.items():
+                if kind == 'scalar':
+                    node_tuples.append((content_hash, field, None, data))
+                elif kind == 'empty_list':
+                    # Use index -1 to mark empty list
+                    node_tuples.append((content_hash, field, -1, None))
+                elif kind == 'list':
+                    for i, item_value in enumerate(data):
+                        node_tuples.append((content_hash, field, i, item_value))
+
+            _ASTON_CONS_CACHE[signature] = (content_hash, node_tuples)
+
+        hashes[id(current)] = content_hash
+        tuples_extend(node_tuples)
+
+    return hashes[id(node)], all_tuples
+
+
+# Below this many top-level statements, process-pool startup costs more
+# than the traversal itself and aston_write_parallel runs in-process
+_ASTON_PARALLEL_THRESHOLD = 64
+
+
+def _aston_write_child(args: Tuple[ast.AST, str]) -> Tuple[str, List[Tuple]]:
+    """Process-pool worker: hash one top-level statement subtree."""
+    node, algorithm = args
+    return aston_write(node, algorithm)
+
+
+def aston_write_parallel(tree: ast.AST, algorithm: str = 'sha256') -> Tuple[str, List[Tuple]]:
+    """Convert a Module to ASTON tuples, fanning out across processes.
+
+    Top-level statements are independent subtrees: each can be hashed and
+    tuple-ified on its own, and the Module node's hash depends only on the
+    children's hashes. Large modules are split across a
+    ProcessPoolExecutor and joined in the parent; small modules (fewer
+    than _ASTON_PARALLEL_THRESHOLD top-level statements) fall back to the
+    in-process aston_write, where pool startup would dominate.
+
+    Args:
+        tree: AST node to convert (parallel path requires a Module)
+        algorithm: Content-hash algorithm ('sha256' or 'blake2b')
+
+    Returns:
+        (content_hash, all_tuples), identical to aston_write output
+    """
+    if not isinstance(tree, ast.Module) or len(tree.body) < _ASTON_PARALLEL_THRESHOLD:
+        return aston_write(tree, algorithm)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    all_tuples = []
+    body_hashes = []
+    child_tuple_lists = []
+    with ProcessPoolExecutor() as executor:
+        jobs = [(stmt, algorithm) for stmt in tree.body]
+        for child_hash, child_tuples in executor.map(_aston_write_child, jobs, chunksize=8):
+            body_hashes.append(child_hash)
+            child_tuple_lists.append(child_tuples)
+    # One extend over the chained results instead of one per child
+    all_tuples.extend(itertools.chain.from_iterable(child_tuple_lists))
+
+    # Emit the Module node itself from the children's hashes, matching the
+    # layout aston_write produces for a list field plus type_ignores
+    obj = {'__class__.__name__': 'Module', 'body': body_hashes}
+    module_tuples = []
+    for i, child_hash in enumerate(body_hashes):
+        module_tuples.append(('body', i, child_hash))
+    type_ignores = []
+    for item in tree.type_ignores:
+        child_hash, child_tuples = aston_write(item, algorithm)
+        all_tuples.extend(child_tuples)
+        type_ignores.append(child_hash)
+    obj['type_ignores'] = type_ignores
+    if type_ignores:
+        for i, child_hash in enumerate(type_ignores):
+            module_tuples.append(('type_ignores', i, child_hash))
+    else:
+        module_tuples.append(('type_ignores', -1, None))
+
+    hasher = _ASTON_HASHERS.get(algorithm)
+    if hasher is None:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+    content_hash = hasher(_aston_canonical_encode(obj)).hexdigest()
+
+    all_tuples.append((content_hash, '__class__.__name__', None, 'Module'))
+    for key, index, value in module_tuples:
+        all_tuples.append((content_hash, key, index, value))
+
     return content_hash, all_tuples
 
 
@@ -762,6 +1154,29 @@ def nstore_create(prefix: Tuple, n: int) -> NStore:
     )
 
 
+@functools.lru_cache(maxsize=256)
+def _nstore_key_prefix(prefix: Tuple, subspace: int) -> bytes:
+    return bytes_write(prefix + (subspace,))
+
+
+def nstore_key(nstore: NStore, subspace: int, items: Tuple) -> bytes:
+    """Build the storage key for a subspace and (possibly partial) tuple.
+
+    Top-level tuple encoding is concatenative, so the constant
+    prefix + subspace part is encoded once per nstore and memoized; only
+    the varying items are encoded per call.
+
+    Args:
+        nstore: NStore instance
+        subspace: Index subspace number
+        items: Tuple items to append after the prefix
+
+    Returns:
+        Encoded key bytes
+    """
+    return _nstore_key_prefix(nstore.prefix, subspace) + bytes_write(items)
+
+
 def nstore_permute(items: Tuple, index: List[int]) -> Tuple:
     """Permute tuple elements according to index.
 
@@ -804,7 +1219,7 @@ def nstore_add(db: sqlite3.Connection, nstore: NStore, items: Tuple) -> None:
     # Add to all permuted indices
     for subspace, index in enumerate(nstore.indices):
         permuted = nstore_permute(items, index)
-        key = bytes_write(nstore.prefix + (subspace,) + permuted)
+        key = nstore_key(nstore, subspace, permuted)
         db_set(db, key, b'\x01')
 
 
@@ -821,7 +1236,7 @@ def nstore_delete(db: sqlite3.Connection, nstore: NStore, items: Tuple) -> None:
     # Delete from all permuted indices
     for subspace, index in enumerate(nstore.indices):
         permuted = nstore_permute(items, index)
-        key = bytes_write(nstore.prefix + (subspace,) + permuted)
+        key = nstore_key(nstore, subspace, permuted)
         db_delete(db, key)
 
 
@@ -839,7 +1254,7 @@ def nstore_ask(db: sqlite3.Connection, nstore: NStore, items: Tuple) -> bool:
     assert len(items) == nstore.n, f"Expected {nstore.n} items, got {len(items)}"
 
     # Check base index
-    key = bytes_write(nstore.prefix + (0,) + items)
+    key = nstore_key(nstore, 0, items)
     return db_get(db, key) is not None
 
 
@@ -978,7 +1393,7 @@ def nstore_query(db: sqlite3.Connection, nstore: NStore, pattern: Tuple, *patter
 
             # Build prefix for range query
             prefix_items = nstore_pattern_to_prefix(bound_pattern, index)
-            key_start = bytes_write(nstore.prefix + (subspace,) + prefix_items)
+            key_start = nstore_key(nstore, subspace, prefix_items)
             key_end = bytes_next(key_start)
             if key_end is None:
                 # All bytes are 0xFF, use next longer sequence
@@ -1027,7 +1442,7 @@ def nstore_count(db: sqlite3.Connection, nstore: NStore, pattern: Tuple) -> int:
 
     # Build prefix for range query
     prefix_items = nstore_pattern_to_prefix(pattern, index)
-    key_start = bytes_write(nstore.prefix + (subspace,) + prefix_items)
+    key_start = nstore_key(nstore, subspace, prefix_items)
     key_end = bytes_next(key_start)
     if key_end is None:
         # All bytes are 0xFF, use next longer sequence
@@ -1057,7 +1472,7 @@ def nstore_bytes(db: sqlite3.Connection, nstore: NStore, pattern: Tuple) -> int:
 
     # Build prefix for range query
     prefix_items = nstore_pattern_to_prefix(pattern, index)
-    key_start = bytes_write(nstore.prefix + (subspace,) + prefix_items)
+    key_start = nstore_key(nstore, subspace, prefix_items)
     key_end = bytes_next(key_start)
     if key_end is None:
         # All bytes are 0xFF, use next longer sequence
@@ -1116,80 +1531,97 @@ def check(target):
     return decorator
 
 
-class ASTNormalizer(ast.NodeTransformer):
-    """Normalizes an AST by renaming variables and functions"""
+def code_rename_names(tree: ast.AST, name_mapping: Dict[str, str]) -> ast.AST:
+    """Rename variables, arguments and function names in place.
+
+    Rename-only transforms never replace a node, so the NodeTransformer
+    machinery (per-node visit_* dispatch, return-value plumbing) is pure
+    overhead: a flat ast.walk with direct attribute writes does the same
+    work in a fraction of the time.
+    """
+    mapping_get = name_mapping.get
+    for node in ast.walk(tree):
+        node_type = type(node)
+        if node_type is ast.Name:
+            new_id = mapping_get(node.id)
+            if new_id is not None:
+                node.id = new_id
+        elif node_type is ast.arg:
+            new_arg = mapping_get(node.arg)
+            if new_arg is not None:
+                node.arg = new_arg
+        elif node_type is ast.FunctionDef or node_type is ast.AsyncFunctionDef:
+            new_name = mapping_get(node.name)
+            if new_name is not None:
+                node.name = new_name
+    return tree
 
-    def __init__(self, name_mapping: Dict[str, str]):
-        self.name_mapping = name_mapping
 
-    def visit_Name(self, node):
-        if node.id in self.name_mapping:
-            node.id = self.name_mapping[node.id]
-        return node
+# Result of the fused single-pass module scan (code_scan):
+# - names: all names (variables, functions, arguments)
+# - imported: names bound by import statements
+# - referenced: names referenced via Name nodes (used for unused-import checks)
+ScanResult = namedtuple('ScanResult', ['names', 'imported', 'referenced'])
 
-    def visit_arg(self, node):
-        if node.arg in self.name_mapping:
-            node.arg = self.name_mapping[node.arg]
-        return node
 
-    def visit_FunctionDef(self, node):
-        if node.name in self.name_mapping:
-            node.name = self.name_mapping[node.name]
-        self.generic_visit(node)
-        return node
+def _code_scan_name(node: ast.Name, result: ScanResult):
+    result.names.add(node.id)
+    result.referenced.add(node.id)
 
-    def visit_AsyncFunctionDef(self, node):
-        """Handle async function definitions the same as regular functions"""
-        if node.name in self.name_mapping:
-            node.name = self.name_mapping[node.name]
-        self.generic_visit(node)
-        return node
 
+def _code_scan_functiondef(node: Union[ast.FunctionDef, ast.AsyncFunctionDef], result: ScanResult):
+    result.names.add(node.name)
+    for arg in node.args.args:
+        result.names.add(arg.arg)
 
-def code_collect_names(tree: ast.Module) -> Set[str]:
-    """Collect all names (variables, functions) used in the AST"""
-    names = set()
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Name):
-            names.add(node.id)
-        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            names.add(node.name)
-            for arg in node.args.args:
-                names.add(arg.arg)
+def _code_scan_import(node: Union[ast.Import, ast.ImportFrom], result: ScanResult):
+    for alias in node.names:
+        result.imported.add(alias.asname if alias.asname else alias.name)
 
-    return names
 
+# Dispatch table keyed on node class: one dict lookup per node instead of
+# an isinstance chain per walk, and one walk instead of one per consumer
+_CODE_SCAN_DISPATCH: Dict[type, Callable] = {
+    ast.Name: _code_scan_name,
+    ast.FunctionDef: _code_scan_functiondef,
+    ast.AsyncFunctionDef: _code_scan_functiondef,
+    ast.Import: _code_scan_import,
+    ast.ImportFrom: _code_scan_import,
+}
 
-def code_get_import_names(tree: ast.Module) -> Set[str]:
-    """Get all names that are imported"""
-    imported = set()
 
+def code_scan(tree: ast.Module) -> ScanResult:
+    """Scan a module in a single ast.walk pass.
+
+    Collects everything the name collection and import helpers need in one
+    traversal instead of one full walk per consumer.
+    """
+    result = ScanResult(set(), set(), set())
+    dispatch_get = _CODE_SCAN_DISPATCH.get
     for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                imported.add(alias.asname if alias.asname else alias.name)
-        elif isinstance(node, ast.ImportFrom):
-            for alias in node.names:
-                imported.add(alias.asname if alias.asname else alias.name)
+        handler = dispatch_get(type(node))
+        if handler is not None:
+            handler(node, result)
+    return result
 
-    return imported
+
+def code_collect_names(tree: ast.Module) -> Set[str]:
+    """Collect all names (variables, functions) used in the AST"""
+    return code_scan(tree).names
+
+
+def code_get_import_names(tree: ast.Module) -> Set[str]:
+    """Get all names that are imported"""
+    return code_scan(tree).imported
 
 
 def code_check_unused_imports(tree: ast.Module, imported_names: Set[str], all_names: Set[str]) -> bool:
     """Check if all imports are used"""
-    for name in imported_names:
-        # Check if the imported name is used anywhere besides the import statement
-        used = False
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.Import, ast.ImportFrom)):
-                continue
-            if isinstance(node, ast.Name) and node.id == name:
-                used = True
-                break
-        if not used:
-            return False
-    return True
+    # One walk collecting referenced names, then a set comparison: Name
+    # nodes never occur inside import statements, so every referenced name
+    # counts as a use
+    return imported_names <= code_scan(tree).referenced
 
 
 def code_sort_imports(tree: ast.Module) -> ast.Module:
@@ -1299,17 +1731,21 @@ def code_create_name_mapping(function_def: Union[ast.FunctionDef, ast.AsyncFunct
     # Collect all names in the function (excluding imported names, built-ins, and bb aliases)
     # Use a set to track seen names and avoid duplicates
     # Include function name in seen_names to handle recursive calls correctly
+    # Union the exclusions once: one set-membership test per node instead
+    # of three
+    exclude = imported_names | PYTHON_BUILTINS | set(bb_aliases)
     seen_names = {function_def.name}
     all_names = list()
     for node in ast.walk(function_def):
-        if isinstance(node, ast.Name) and node.id not in imported_names and node.id not in PYTHON_BUILTINS and node.id not in bb_aliases:
-            if node.id not in seen_names:
-                seen_names.add(node.id)
-                all_names.append(node.id)
-        elif isinstance(node, ast.arg) and node.arg not in imported_names and node.arg not in PYTHON_BUILTINS and node.arg not in bb_aliases:
-            if node.arg not in seen_names:
-                seen_names.add(node.arg)
-                all_names.append(node.arg)
+        if isinstance(node, ast.Name):
+            name = node.id
+        elif isinstance(node, ast.arg):
+            name = node.arg
+        else:
+            continue
+        if name not in exclude and name not in seen_names:
+            seen_names.add(name)
+            all_names.append(name)
 
     # XXX: all_names: do not sort, keep the order ast traversal
     # discovery.
@@ -1344,6 +1780,7 @@ def code_rewrite_bb_imports(imports: List[ast.stmt]) -> Tuple[List[ast.stmt], Di
             # Rewrite: from bb.pool import object_c0ffeebad as kawa
             # To: from bb.pool import object_c0ffeebad
             new_names = []
+            rebuilt = False
             for alias in imp.names:
                 import_name = alias.name  # e.g., "object_c0ff33..."
 
@@ -1354,19 +1791,27 @@ def code_rewrite_bb_imports(imports: List[ast.stmt]) -> Tuple[List[ast.stmt], Di
                     # Backward compatibility: no prefix (shouldn't happen in new code)
                     actual_hash = import_name
 
-                # Track the alias mapping using actual hash
+                # Strip the alias (but keep object_ prefix in import name).
+                # Aliases without asname are already in normalized form and
+                # are reused as-is instead of being reallocated.
                 if alias.asname:
                     alias_mapping[actual_hash] = alias.asname
-
-                # Create new import without alias (but keep object_ prefix in import name)
-                new_names.append(ast.alias(name=import_name, asname=None))
-
-            new_imp = ast.ImportFrom(
-                module='bb.pool',
-                names=new_names,
-                level=0
-            )
-            new_imports.append(new_imp)
+                    new_names.append(ast.alias(name=import_name, asname=None))
+                    rebuilt = True
+                else:
+                    new_names.append(alias)
+
+            if rebuilt:
+                new_imp = ast.ImportFrom(
+                    module='bb.pool',
+                    names=new_names,
+                    level=0
+                )
+                new_imports.append(new_imp)
+            else:
+                # Nothing stripped: the import is already normalized,
+                # preserve node identity
+                new_imports.append(imp)
         else:
             new_imports.append(imp)
 
@@ -1381,36 +1826,59 @@ def code_replace_bb_calls(tree: ast.AST, alias_mapping: Dict[str, str], name_map
     alias_mapping maps actual hash (without prefix) -> alias name
     The replacement uses object_<hash> to match the import name.
     """
-    class BBCallReplacer(ast.NodeTransformer):
-        def visit_Name(self, node):
-            # If this name is an alias for a bb function
-            for func_hash, alias in alias_mapping.items():
-                if node.id == alias:
-                    # Replace with object_c0ffeebad._bb_v_0
-                    # Use prefixed name to match the import statement
-                    prefixed_name = BB_IMPORT_PREFIX + func_hash
-                    return ast.Attribute(
-                        value=ast.Name(id=prefixed_name, ctx=ast.Load()),
-                        attr='_bb_v_0',
-                        ctx=node.ctx
-                    )
-            return node
+    if not alias_mapping:
+        return tree
+
+    # Invert hash -> alias once so each Name costs one dict lookup instead
+    # of a linear scan over every alias
+    alias_to_hash = {alias: func_hash for func_hash, alias in alias_mapping.items()}
+    alias_to_hash_get = alias_to_hash.get
+
+    def replacement_build(node: ast.Name):
+        # If this name is an alias for a bb function, replace it with
+        # object_c0ffeebad._bb_v_0 (prefixed name matches the import)
+        func_hash = alias_to_hash_get(node.id)
+        if func_hash is None:
+            return None
+        return ast.Attribute(
+            value=ast.Name(id=BB_IMPORT_PREFIX + func_hash, ctx=ast.Load()),
+            attr='_bb_v_0',
+            ctx=node.ctx
+        )
 
-    replacer = BBCallReplacer()
-    return replacer.visit(tree)
+    # Only leaf Name nodes are ever replaced, so a single walk over parent
+    # slots (ast.iter_fields) is enough -- no NodeTransformer rebuild.
+    # Freshly built Attribute nodes carry a prefixed Name that matches no
+    # alias, so visiting them later in the walk is a harmless no-op.
+    for parent in ast.walk(tree):
+        for field, value in ast.iter_fields(parent):
+            if type(value) is list:
+                for index, child in enumerate(value):
+                    if type(child) is ast.Name:
+                        replacement = replacement_build(child)
+                        if replacement is not None:
+                            value[index] = replacement
+            elif type(value) is ast.Name:
+                replacement = replacement_build(value)
+                if replacement is not None:
+                    setattr(parent, field, replacement)
+    return tree
 
 
 def code_clear_locations(tree: ast.AST):
-    """Set all line and column information to None"""
+    """Remove all line and column information.
+
+    Popping from __dict__ avoids four hasattr checks (exception-based in
+    CPython) plus four attribute writes per node. Absent attributes behave
+    like a freshly built tree: ast.unparse never reads them and
+    ast.fix_missing_locations re-synthesizes them on demand.
+    """
     for node in ast.walk(tree):
-        if hasattr(node, 'lineno'):
-            node.lineno = None
-        if hasattr(node, 'col_offset'):
-            node.col_offset = None
-        if hasattr(node, 'end_lineno'):
-            node.end_lineno = None
-        if hasattr(node, 'end_col_offset'):
-            node.end_col_offset = None
+        node_dict = node.__dict__
+        node_dict.pop('lineno', None)
+        node_dict.pop('col_offset', None)
+        node_dict.pop('end_lineno', None)
+        node_dict.pop('end_col_offset', None)
 
 
 def code_extract_docstring(function_def: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> Tuple[str, Union[ast.FunctionDef, ast.AsyncFunctionDef]]:
@@ -1420,20 +1888,55 @@ def code_extract_docstring(function_def: Union[ast.FunctionDef, ast.AsyncFunctio
     """
     docstring = ast.get_docstring(function_def)
 
-    # Create a copy of the function without the docstring
+    # Shallow clone instead of deepcopy: only the body differs (docstring
+    # statement stripped), so args, decorators and the remaining body
+    # statements are shared by reference. Normalization later mutates the
+    # shared nodes in place, but both the with-docstring and
+    # without-docstring modules receive the same idempotent transformation,
+    # so sharing is safe and avoids copying the whole subtree.
     import copy
-    func_copy = copy.deepcopy(function_def)
+    func_copy = copy.copy(function_def)
 
     # Remove docstring if it exists (first statement is a string constant)
-    if (func_copy.body and
-        isinstance(func_copy.body[0], ast.Expr) and
-        isinstance(func_copy.body[0].value, ast.Constant) and
-        isinstance(func_copy.body[0].value.value, str)):
-        func_copy.body = func_copy.body[1:]
+    if (function_def.body and
+        isinstance(function_def.body[0], ast.Expr) and
+        isinstance(function_def.body[0].value, ast.Constant) and
+        isinstance(function_def.body[0].value.value, str)):
+        func_copy.body = function_def.body[1:]
+    else:
+        func_copy.body = list(function_def.body)
 
     return docstring if docstring else "", func_copy
 
 
+def code_splice_docstring(normalized_code: str, docstring: str) -> str:
+    """
+    Insert a docstring as the first statement of the normalized function.
+
+    The docstring is rendered through ast.unparse on a one-statement holder
+    function so its source form (triple quotes, escaping, indentation) is
+    byte-identical to what unparsing a module that contains it would
+    produce, without re-unparsing the whole module.
+
+    docstring must be the raw constant value (not the cleaned form returned
+    by ast.get_docstring) so indentation survives; None means no docstring.
+    """
+    if docstring is None:
+        return normalized_code
+
+    holder = ast.parse('def _bb_v_0():\n    pass')
+    holder.body[0].body = [ast.Expr(value=ast.Constant(value=docstring))]
+    docstring_lines = ast.unparse(holder).split('\n')[1:]
+
+    lines = normalized_code.split('\n')
+    for index, line in enumerate(lines):
+        # The function definition is the only top-level def; nested
+        # definitions are indented and never match
+        if line.startswith('def _bb_v_0') or line.startswith('async def _bb_v_0'):
+            return '\n'.join(lines[:index + 1] + docstring_lines + lines[index + 1:])
+    return normalized_code
+
+
 def code_normalize(tree: ast.Module, lang: str) -> Tuple[str, str, str, Dict[str, str], Dict[str, str]]:
     """
     Normalize the AST according to bb rules.
@@ -1445,8 +1948,17 @@ def code_normalize(tree: ast.Module, lang: str) -> Tuple[str, str, str, Dict[str
     # Extract function and imports
     function_def, imports = code_extract_definition(tree)
 
-    # Extract docstring from function
+    # Extract docstring from function. The raw constant (as opposed to the
+    # cleaned form ast.get_docstring returns) is kept for splicing so the
+    # displayed code preserves the original indentation.
     docstring, function_without_docstring = code_extract_docstring(function_def)
+    body = function_def.body
+    if (body and isinstance(body[0], ast.Expr) and
+            isinstance(body[0].value, ast.Constant) and
+            isinstance(body[0].value.value, str)):
+        raw_docstring = body[0].value.value
+    else:
+        raw_docstring = None
 
     # Rewrite bb imports
     imports, alias_mapping = code_rewrite_bb_imports(imports)
@@ -1457,36 +1969,37 @@ def code_normalize(tree: ast.Module, lang: str) -> Tuple[str, str, str, Dict[str
     # Create name mapping
     forward_mapping, reverse_mapping = code_create_name_mapping(function_def, imports, bb_aliases)
 
-    # Create two modules: one with docstring (for display) and one without (for hashing)
-    module_with_docstring = ast.Module(body=imports + [function_def], type_ignores=[])
+    # Build only the module without docstring: the two variants differ by a
+    # single statement, so unparsing both walks the whole tree twice for
+    # nothing. Unparse once and splice the docstring back in as a string
+    # operation.
     module_without_docstring = ast.Module(body=imports + [function_without_docstring], type_ignores=[])
 
-    # Process both modules identically
-    for module in [module_with_docstring, module_without_docstring]:
-        # Replace bb calls with their normalized form
-        module = code_replace_bb_calls(module, alias_mapping, forward_mapping)
-
-        # Normalize names
-        normalizer = ASTNormalizer(forward_mapping)
-        normalizer.visit(module)
+    # Replace bb calls with their normalized form
+    module_without_docstring = code_replace_bb_calls(module_without_docstring, alias_mapping, forward_mapping)
 
-        # Clear locations
-        code_clear_locations(module)
+    # Normalize names
+    code_rename_names(module_without_docstring, forward_mapping)
 
-        # Fix missing locations
-        ast.fix_missing_locations(module)
+    # Clear locations then re-synthesize defaults: ast.unparse consults
+    # lineno for type-comment lookup, so the tree cannot stay bare.
+    code_clear_locations(module_without_docstring)
+    ast.fix_missing_locations(module_without_docstring)
 
-    # Unparse both versions
-    normalized_code_with_docstring = ast.unparse(module_with_docstring)
     normalized_code_without_docstring = ast.unparse(module_without_docstring)
+    normalized_code_with_docstring = code_splice_docstring(normalized_code_without_docstring, raw_docstring)
 
     return normalized_code_with_docstring, normalized_code_without_docstring, docstring, reverse_mapping, alias_mapping
 
 
+@functools.lru_cache(maxsize=4096)
 def hash_compute(code: str, algorithm: str = 'sha256') -> str:
     """
     Compute hash of the code using specified algorithm.
 
+    Results are memoized: saving or validating the same content repeatedly
+    (common in batch operations) hashes it only once.
+
     Args:
         code: The code to hash
         algorithm: Hash algorithm to use (default: 'sha256')
@@ -1496,6 +2009,8 @@ def hash_compute(code: str, algorithm: str = 'sha256') -> str:
     """
     if algorithm == 'sha256':
         return hashlib.sha256(code.encode('utf-8')).hexdigest()
+    elif algorithm == 'blake2b':
+        return _blake2b_256(code.encode('utf-8')).hexdigest()
     else:
         raise ValueError(f"Unsupported hash algorithm: {algorithm}")
 
@@ -1777,6 +2292,27 @@ def command_whoami(subcommand: str, value: list = None):
             print(f"Set {subcommand}: {value[0]}")
 
 
+# Bumped by every save so cached reads keyed on it expire. Within one
+# CLI invocation the pool only changes through the save functions —
+# nothing deletes pool entries in-process — so saves are the only
+# automatic invalidation trigger; code that removes or replaces pool
+# files out of band (test fixtures wiping a pool directory) must call
+# storage_invalidate_caches itself.
+_POOL_GENERATION = 0
+
+
+def storage_invalidate_caches() -> None:
+    """
+    Expire in-process pool read caches.
+
+    Saves bump the pool generation themselves; call this after deleting
+    or replacing pool files through any other channel so cached reads
+    stop serving entries that no longer exist on disk.
+    """
+    global _POOL_GENERATION
+    _POOL_GENERATION += 1
+
+
 def code_save_v1(hash_value: str, normalized_code: str, metadata: Dict[str, any]):
     """
     Save function to bb directory using schema v1.
@@ -1790,6 +2326,9 @@ def code_save_v1(hash_value: str, normalized_code: str, metadata: Dict[str, any]
         normalized_code: Normalized code with docstring
         metadata: Metadata dict (created, author)
     """
+    global _POOL_GENERATION
+    _POOL_GENERATION += 1
+
     pool_dir = storage_get_pool_directory()
 
     # Create function directory: pool/XX/YYYYYY.../
@@ -1806,8 +2345,14 @@ def code_save_v1(hash_value: str, normalized_code: str, metadata: Dict[str, any]
         'metadata': metadata
     }
 
-    with open(object_json, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Serialize in memory then write once: json.dump streams many small
+    # writes through the text-IO layer, one write keeps this a single
+    # call. Publishing via rename makes the file appear atomically, so
+    # a concurrent reader never sees a partially written object.json.
+    object_json_tmp = func_dir / 'object.json.tmp'
+    with open(object_json_tmp, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(data, indent=2, ensure_ascii=False))
+    os.replace(object_json_tmp, object_json)
 
     print(f"Hash: {hash_value}")
 
@@ -1835,6 +2380,9 @@ def mapping_save_v1(func_hash: str, lang: str, docstring: str,
     Returns:
         Mapping hash (64-character hex)
     """
+    global _POOL_GENERATION
+    _POOL_GENERATION += 1
+
     pool_dir = storage_get_pool_directory()
 
     # Compute mapping hash
@@ -1845,8 +2393,13 @@ def mapping_save_v1(func_hash: str, lang: str, docstring: str,
     mapping_dir = func_dir / lang / mapping_hash[:2] / mapping_hash[2:]
     mapping_dir.mkdir(parents=True, exist_ok=True)
 
-    # Create mapping.json
+    # Create mapping.json; content addressing guarantees an existing
+    # file is byte-identical, so saving the same mapping again skips
+    # the serialization and the write
     mapping_json = mapping_dir / 'mapping.json'
+    if mapping_json.exists():
+        print(f"Mapping hash: {mapping_hash}")
+        return mapping_hash
 
     data = {
         'docstring': docstring,
@@ -1855,8 +2408,12 @@ def mapping_save_v1(func_hash: str, lang: str, docstring: str,
         'comment': comment
     }
 
-    with open(mapping_json, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Serialize in memory then write once, publishing via rename so the
+    # file appears atomically (see code_save_v1)
+    mapping_json_tmp = mapping_dir / 'mapping.json.tmp'
+    with open(mapping_json_tmp, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(data, indent=2, ensure_ascii=False))
+    os.replace(mapping_json_tmp, mapping_json)
 
     print(f"Mapping hash: {mapping_hash}")
 
@@ -2026,6 +2583,10 @@ def git_url_parse(url: str) -> Dict[str, str]:
     - git+https://host/user/repo.git (HTTPS)
     - git+file:///path/to/repo (Local file)
 
+    Results are memoized per URL; the same remote URL gets parsed on
+    every command that touches it, so cache the parse and rebuild a
+    fresh dict per call (callers may mutate their copy).
+
     Args:
         url: Git URL to parse
 
@@ -2033,6 +2594,11 @@ def git_url_parse(url: str) -> Dict[str, str]:
         Dictionary with keys: protocol, host, path, original_url
         protocol: 'ssh', 'https', or 'file'
     """
+    return dict(_git_url_parse_cached(url))
+
+
+@functools.lru_cache(maxsize=256)
+def _git_url_parse_cached(url: str) -> Tuple[Tuple[str, str], ...]:
     result = {'original_url': url}
 
     if url.startswith('git@'):
@@ -2065,7 +2631,20 @@ def git_url_parse(url: str) -> Dict[str, str]:
     else:
         raise ValueError(f"Unsupported Git URL format: {url}")
 
-    return result
+    return tuple(result.items())
+
+
+# Prefix dispatch table for git_detect_remote_type: longest prefixes first
+# so 'git+https://' wins over a hypothetical shorter overlap, scanned once
+# per call instead of a chain of if/elif branches
+_GIT_REMOTE_PREFIXES = (
+    ('git+https://', 'git-https'),
+    ('git+file://', 'git-file'),
+    ('file://', 'file'),
+    ('https://', 'https'),
+    ('http://', 'http'),
+    ('git@', 'git-ssh'),
+)
 
 
 def git_detect_remote_type(url: str) -> str:
@@ -2078,34 +2657,32 @@ def git_detect_remote_type(url: str) -> str:
     Returns:
         Remote type: 'file', 'git-ssh', 'git-https', 'git-file', 'http', 'https'
     """
-    if url.startswith('file://'):
-        return 'file'
-    elif url.startswith('git@'):
-        return 'git-ssh'
-    elif url.startswith('git+https://'):
-        return 'git-https'
-    elif url.startswith('git+file://'):
-        return 'git-file'
-    elif url.startswith('https://'):
-        return 'https'
-    elif url.startswith('http://'):
-        return 'http'
-    else:
-        return 'unknown'
+    for prefix, remote_type in _GIT_REMOTE_PREFIXES:
+        if url.startswith(prefix):
+            return remote_type
+    return 'unknown'
+
+
+@functools.lru_cache(maxsize=256)
+def _git_cache_path_cached(bb_dir: str, remote_name: str) -> Path:
+    return Path(bb_dir) / 'cache' / 'git' / remote_name
 
 
 def git_cache_path(remote_name: str) -> Path:
     """
     Get the cache path for a Git remote repository.
 
+    Memoized per (bb directory, remote name): keying on the resolved
+    directory keeps the cache correct when BB_DIRECTORY changes, as it
+    does between tests, without any explicit invalidation.
+
     Args:
         remote_name: Name of the remote
 
     Returns:
         Path to the cached repository directory
     """
-    bb_dir = storage_get_bb_directory()
-    return bb_dir / 'cache' / 'git' / remote_name
+    return _git_cache_path_cached(str(storage_get_bb_directory()), remote_name)
 
 
 def git_clone_or_fetch(git_url: str, local_path: Path) -> bool:
@@ -2803,12 +3380,14 @@ def command_remote_sync():
     print("Sync complete.")
 
 
-def code_extract_dependencies(normalized_code: str) -> List[str]:
-    """
-    Extract bb dependencies from normalized code.
+@functools.lru_cache(maxsize=256)
+def _code_extract_dependencies_cached(normalized_code: str) -> Tuple[str, ...]:
+    """Parse normalized code and collect bb dependency hashes.
 
-    Returns:
-        List of actual function hashes (without object_ prefix) that this function depends on
+    Memoized: transitive dependency resolution re-parses the same
+    normalized code once per dependent, and the extraction is read-only so
+    caching by source string is safe (unlike caching the mutable
+    ast.Module itself, which normalization would corrupt).
     """
     dependencies = []
     tree = ast.parse(normalized_code)
@@ -2824,7 +3403,17 @@ def code_extract_dependencies(normalized_code: str) -> List[str]:
                     actual_hash = import_name  # Backward compatibility
                 dependencies.append(actual_hash)
 
-    return dependencies
+    return tuple(dependencies)
+
+
+def code_extract_dependencies(normalized_code: str) -> List[str]:
+    """
+    Extract bb dependencies from normalized code.
+
+    Returns:
+        List of actual function hashes (without object_ prefix) that this function depends on
+    """
+    return list(_code_extract_dependencies_cached(normalized_code))
 
 
 def code_resolve_dependencies(func_hash: str) -> List[str]:
@@ -3742,6 +4331,8 @@ def code_load_v1(hash_value: str) -> Dict[str, any]:
     Load function from bb directory using schema v1.
 
     Loads only the object.json file (no language-specific data).
+    Repeat loads within one invocation are served from an in-process
+    cache; saves bump the pool generation to expire stale entries.
 
     Args:
         hash_value: Function hash (64-character hex)
@@ -3750,9 +4341,18 @@ def code_load_v1(hash_value: str) -> Dict[str, any]:
         Dictionary with schema_version, hash, normalized_code, metadata
     """
     pool_dir = storage_get_pool_directory()
+    return _code_load_v1_cached(_POOL_GENERATION, str(pool_dir), hash_value)
+
 
+@functools.lru_cache(maxsize=1024)
+def _code_load_v1_cached(generation: int, pool_dir: str, hash_value: str) -> Dict[str, any]:
+    """Read and parse object.json; cached per (generation, pool, hash).
+
+    Callers treat the returned dictionary as read-only, so cache hits
+    share it instead of re-reading and re-parsing the file.
+    """
     # Build path: pool/XX/YYYYYY.../object.json
-    func_dir = pool_dir / hash_value[:2] / hash_value[2:]
+    func_dir = Path(pool_dir) / hash_value[:2] / hash_value[2:]
     object_json = func_dir / 'object.json'
 
     # Check if file exists
@@ -3760,10 +4360,10 @@ def code_load_v1(hash_value: str) -> Dict[str, any]:
         print(f"Error: Function not found (v1): {hash_value}", file=sys.stderr)
         sys.exit(1)
 
-    # Load the JSON data
+    # Load the JSON data; reading bytes lets json.loads decode UTF-8
+    # itself instead of going through a text-mode wrapper
     try:
-        with open(object_json, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = json.loads(object_json.read_bytes())
     except json.JSONDecodeError as e:
         print(f"Error: Failed to parse object.json: {e}", file=sys.stderr)
         sys.exit(1)
@@ -3817,8 +4417,7 @@ def mappings_list_v1(func_hash: str, lang: str) -> list:
 
             # Load mapping to get comment
             try:
-                with open(mapping_json, 'r', encoding='utf-8') as f:
-                    mapping_data = json.load(f)
+                mapping_data = json.loads(mapping_json.read_bytes())
                 comment = mapping_data.get('comment', '')
                 mappings.append((mapping_hash, comment))
             except (json.JSONDecodeError, IOError):
@@ -3854,8 +4453,7 @@ def mapping_load_v1(func_hash: str, lang: str, mapping_hash: str) -> Tuple[str,
 
     # Load the JSON data
     try:
-        with open(mapping_json, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = json.loads(mapping_json.read_bytes())
     except json.JSONDecodeError as e:
         print(f"Error: Failed to parse mapping.json: {e}", file=sys.stderr)
         sys.exit(1)
@@ -3880,37 +4478,33 @@ def code_load(hash_value: str, lang: str, mapping_hash: str = None) -> Tuple[str
     Returns:
         Tuple of (normalized_code, name_mapping, alias_mapping, docstring)
     """
-    # Detect schema version
-    version = code_detect_schema(hash_value)
-
-    if version is None:
-        print(f"Error: Function not found: {hash_value}", file=sys.stderr)
-        sys.exit(1)
-
-    # Load v1 format
-    # Load object.json
+    # Load object.json directly; code_load_v1 reports missing functions
+    # itself, so a separate code_detect_schema stat of the same file
+    # would only double the filesystem round-trips
     func_data = code_load_v1(hash_value)
     normalized_code = func_data['normalized_code']
 
-    # Get available mappings
-    mappings = mappings_list_v1(hash_value, lang)
-
-    if len(mappings) == 0:
-        print(f"Error: No mappings found for language '{lang}'", file=sys.stderr)
-        sys.exit(1)
-
-    # Determine which mapping to load
     if mapping_hash is not None:
-        # Explicit mapping requested
+        # Explicit mapping requested: load it directly instead of first
+        # scanning (and JSON-parsing) every mapping variant of the
+        # language just to confirm it exists — mapping_load_v1 reports
+        # a missing mapping itself
         selected_hash = mapping_hash
-    elif len(mappings) == 1:
-        # Only one mapping available
-        selected_hash, _ = mappings[0]
     else:
-        # Multiple mappings available - pick first alphabetically for now
-        # (Phase 5 will improve this with a selection menu)
-        mappings_sorted = sorted(mappings, key=lambda x: x[0])
-        selected_hash, _ = mappings_sorted[0]
+        # Get available mappings
+        mappings = mappings_list_v1(hash_value, lang)
+
+        if len(mappings) == 0:
+            print(f"Error: No mappings found for language '{lang}'", file=sys.stderr)
+            sys.exit(1)
+
+        if len(mappings) == 1:
+            # Only one mapping available
+            selected_hash, _ = mappings[0]
+        else:
+            # Multiple mappings available - pick first alphabetically for now
+            # (Phase 5 will improve this with a selection menu)
+            selected_hash = min(mapping[0] for mapping in mappings)
 
     # Load the mapping
     docstring, name_mapping, alias_mapping, comment = mapping_load_v1(hash_value, lang, selected_hash)
@@ -4091,8 +4685,7 @@ def schema_validate_v1(func_hash: str) -> tuple:
 
     # Validate object.json structure
     try:
-        with open(object_json, 'r', encoding='utf-8') as f:
-            func_data = json.load(f)
+        func_data = json.loads(object_json.read_bytes())
 
         # Check required fields
         required_fields = ['schema_version', 'hash', 'normalized_code', 'metadata']
@@ -4181,18 +4774,23 @@ def schema_validate_directory() -> tuple:
         errors.append(f"Pool directory does not exist: {pool_dir}")
         return False, errors, stats
 
-    # Collect all function hashes and validate each
+    # Collect all function hashes and validate each; os.scandir exposes
+    # the directory entry type from the readdir batch itself, so the
+    # walk avoids a stat() per entry that Path.iterdir would pay
     all_hashes = set()
-    for prefix_dir in pool_dir.iterdir():
-        if not prefix_dir.is_dir() or len(prefix_dir.name) != 2:
-            continue
+    valid_hashes = set()
+    with os.scandir(pool_dir) as prefix_entries:
+        prefix_dirs = [(entry.name, entry.path) for entry in prefix_entries
+                       if entry.is_dir() and len(entry.name) == 2]
 
-        for func_dir in prefix_dir.iterdir():
-            if not func_dir.is_dir():
-                continue
+    for prefix_name, prefix_path in prefix_dirs:
+        with os.scandir(prefix_path) as func_entries:
+            func_dirs = [(entry.name, entry.path) for entry in func_entries
+                         if entry.is_dir()]
 
+        for func_name, func_path in func_dirs:
             # Reconstruct hash
-            func_hash = prefix_dir.name + func_dir.name
+            func_hash = prefix_name + func_name
 
             # Skip if not a valid hash format
             if len(func_hash) != 64:
@@ -4207,23 +4805,22 @@ def schema_validate_directory() -> tuple:
             is_valid, func_errors = schema_validate_v1(func_hash)
             if is_valid:
                 stats['functions_valid'] += 1
+                valid_hashes.add(func_hash)
 
                 # Check for available languages
-                for item in func_dir.iterdir():
-                    if item.is_dir() and not item.name.startswith('.'):
-                        stats['languages_total'].add(item.name)
+                with os.scandir(func_path) as items:
+                    for item in items:
+                        if item.is_dir() and not item.name.startswith('.'):
+                            stats['languages_total'].add(item.name)
             else:
                 stats['functions_invalid'] += 1
                 for err in func_errors:
                     errors.append(f"[{func_hash[:12]}...] {err}")
 
-    # Verify all dependencies are resolvable (only for valid functions)
-    for func_hash in all_hashes:
-        # Skip if this function had validation errors
-        is_valid, _ = schema_validate_v1(func_hash)
-        if not is_valid:
-            continue
-
+    # Verify all dependencies are resolvable (only for valid functions);
+    # validity was already established in the walk above, so functions
+    # that failed are skipped without re-reading their files
+    for func_hash in valid_hashes:
         try:
             func_data = code_load_v1(func_hash)
             normalized_code = func_data['normalized_code']
@@ -5130,13 +5727,14 @@ def command_compile(hash_with_lang: str, python_mode: bool = False, debug_mode:
     print("Compilation complete!")
 
 
-def command_aston(filepath: str, test_mode: bool = False):
+def command_aston(filepath: str, test_mode: bool = False, algorithm: str = 'sha256'):
     """
     Convert Python source file to ASTON representation.
 
     Args:
         filepath: Path to Python source file
         test_mode: If True, run round-trip test instead of outputting tuples
+        algorithm: Content-hash algorithm ('sha256' or 'blake2b')
     """
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -5154,9 +5752,12 @@ def command_aston(filepath: str, test_mode: bool = False):
         print(f"Syntax error in {filepath}: {e}", file=sys.stderr)
         sys.exit(1)
 
+    # Fresh hash-cons cache per invocation
+    _ASTON_CONS_CACHE.clear()
+
     if test_mode:
         # Test round-trip: expected == aston_read(aston_write(expected))
-        _, tuples = aston_write(tree)
+        _, tuples = aston_write_parallel(tree, algorithm)
         reconstructed = aston_read(tuples)
 
         # Compare using ast.dump
@@ -5175,13 +5776,30 @@ def command_aston(filepath: str, test_mode: bool = False):
             print(reconstructed_dump[:500], file=sys.stderr)
             sys.exit(1)
     else:
-        # Normal mode - output tuples as JSON lines
-        _, tuples = aston_write(tree)
-        for tup in tuples:
-            print(json.dumps(tup, ensure_ascii=False))
+        # Normal mode - output tuples as JSON lines. Serialize everything
+        # into one buffer and write it in a single call: per-tuple print()
+        # acquires the stdout lock and flushes line-buffered, which
+        # dominates wall time on large files.
+        _, tuples = aston_write_parallel(tree, algorithm)
+        dumps = json.dumps
+        lines = [dumps(tup, ensure_ascii=False) for tup in tuples]
+        lines.append('')
+        output = '\n'.join(lines)
+        buffer = getattr(sys.stdout, 'buffer', None)
+        if buffer is not None:
+            buffer.write(output.encode('utf-8'))
+        else:
+            # In-process cli_run redirects stdout to a StringIO, which
+            # has no binary buffer; fall back to the text layer
+            sys.stdout.write(output)
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    """CLI entry point.
+
+    argv defaults to sys.argv[1:]; passing it explicitly lets tests invoke
+    the CLI in-process instead of spawning an interpreter per command.
+    """
     parser = argparse.ArgumentParser(description='bb - Function pool manager')
     subparsers = parser.add_subparsers(dest='command', help='Commands')
 
@@ -5294,8 +5912,10 @@ def main():
     aston_parser = subparsers.add_parser('aston', help='Convert Python file to ASTON representation')
     aston_parser.add_argument('file', help='Path to Python source file')
     aston_parser.add_argument('--test', action='store_true', help='Run round-trip test instead of outputting tuples')
+    aston_parser.add_argument('--hash', choices=['sha256', 'blake2b'], default='sha256',
+                              help='Content-hash algorithm (default: sha256)')
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.command == 'init':
         command_init()
@@ -5375,7 +5995,7 @@ def main():
     elif args.command == 'commit':
         command_commit(args.hash, comment=args.comment)
     elif args.command == 'aston':
-        command_aston(args.file, test_mode=args.test)
+        command_aston(args.file, test_mode=args.test, algorithm=args.hash)
     else:
         parser.print_help()
 
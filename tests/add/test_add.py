@@ -9,6 +9,8 @@ Grey-box style:
 import json
 from pathlib import Path
 
+from tests.conftest import stdout_extract_hash
+
 
 def test_add_simple_function(cli_runner, tmp_path):
     """Test adding a simple function via CLI"""
@@ -27,7 +29,7 @@ def test_add_simple_function(cli_runner, tmp_path):
     assert 'Hash:' in result.stdout
 
     # Extract hash and verify file was created
-    func_hash = result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(result.stdout)
     assert len(func_hash) == 64
 
     # Verify object was stored
@@ -217,7 +219,7 @@ def analyze(data):
     assert result.returncode == 0
 
     # Verify imports are preserved in object.json
-    func_hash = result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(result.stdout)
     func_dir = cli_runner.pool_dir / func_hash[:2] / func_hash[2:]
     object_json = func_dir / 'object.json'
 
@@ -9,7 +9,7 @@ import ast
 import pytest
 
 import bb
-from tests.conftest import normalize_code_for_test
+from tests.conftest import normalize_code_for_test, parse_for_test
 
 
 # =============================================================================
@@ -82,7 +82,7 @@ def test_normalize_simple_async_function():
     """Fetch data asynchronously"""
     return await some_api()
 '''
-    tree = ast.parse(code)
+    tree = parse_for_test(code)
 
     func_def, imports = bb.code_extract_definition(tree)
 
@@ -97,7 +97,7 @@ def test_normalize_async_function_with_parameters():
     result = await do_work(item)
     return result
 '''
-    tree = ast.parse(code)
+    tree = parse_for_test(code)
     func_def, imports = bb.code_extract_definition(tree)
 
     name_mapping, reverse_mapping = bb.code_create_name_mapping(func_def, imports, {})
@@ -117,7 +117,7 @@ def test_normalize_async_function_with_await_expressions():
     result = await response.json()
     return result
 '''
-    tree = ast.parse(code)
+    tree = parse_for_test(code)
     func_def, imports = bb.code_extract_definition(tree)
 
     name_mapping, reverse_mapping = bb.code_create_name_mapping(func_def, imports, {})
@@ -143,8 +143,8 @@ def test_async_function_hash_determinism():
     return result
 '''
 
-    tree_eng = ast.parse(code_eng)
-    tree_fra = ast.parse(code_fra)
+    tree_eng = parse_for_test(code_eng)
+    tree_fra = parse_for_test(code_fra)
 
     _, normalized_eng_no_doc, _, _, _ = bb.code_normalize(tree_eng, "eng")
     _, normalized_fra_no_doc, _, _, _ = bb.code_normalize(tree_fra, "fra")
@@ -161,7 +161,7 @@ def test_async_function_preserves_async_keyword():
     """Do async stuff"""
     return await something()
 '''
-    tree = ast.parse(code)
+    tree = parse_for_test(code)
 
     normalized_with_doc, normalized_without_doc, _, _, _ = bb.code_normalize(tree, "eng")
 
@@ -169,16 +169,15 @@ def test_async_function_preserves_async_keyword():
     assert "async def _bb_v_0" in normalized_without_doc
 
 
-def test_ast_normalizer_visit_async_function_def():
-    """Test ASTNormalizer handles AsyncFunctionDef"""
+def test_code_rename_names_async_function_def():
+    """Test code_rename_names handles AsyncFunctionDef"""
     code = '''async def original_name():
     pass
 '''
-    tree = ast.parse(code)
+    tree = parse_for_test(code)
 
     name_mapping = {"original_name": "_bb_v_0"}
-    normalizer = bb.ASTNormalizer(name_mapping)
-    transformed = normalizer.visit(tree)
+    transformed = bb.code_rename_names(tree, name_mapping)
 
     func_def = transformed.body[0]
     assert isinstance(func_def, ast.AsyncFunctionDef)
@@ -191,7 +190,7 @@ def test_names_collect_includes_async_function():
     local_var = 42
     return local_var
 '''
-    tree = ast.parse(code)
+    tree = parse_for_test(code)
 
     names = bb.code_collect_names(tree)
 
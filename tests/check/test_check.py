@@ -9,6 +9,8 @@ Grey-box style:
 import json
 from pathlib import Path
 
+from tests.conftest import stdout_extract_hash
+
 
 def test_add_function_with_check_decorator(cli_runner, tmp_path):
     """Test adding a function with @check decorator stores checks in metadata"""
@@ -41,7 +43,7 @@ def test_add():
     assert 'Hash:' in result.stdout
 
     # Extract hash
-    test_hash = result.stdout.split('Hash:')[1].strip().split()[0]
+    test_hash = stdout_extract_hash(result.stdout)
 
     # Verify metadata contains checks
     func_dir = cli_runner.pool_dir / test_hash[:2] / test_hash[2:]
@@ -94,7 +96,7 @@ def test_math():
     assert result.returncode == 0
 
     # Extract hash
-    test_hash = result.stdout.split('Hash:')[1].strip().split()[0]
+    test_hash = stdout_extract_hash(result.stdout)
 
     # Verify metadata contains both checks
     func_dir = cli_runner.pool_dir / test_hash[:2] / test_hash[2:]
@@ -132,7 +134,7 @@ def test_multiply():
 ''')
 
     result = cli_runner.run(['add', f'{test_file}@eng'])
-    test_hash = result.stdout.split('Hash:')[1].strip().split()[0]
+    test_hash = stdout_extract_hash(result.stdout)
 
     # Test: Run check command
     check_result = cli_runner.run(['check', target_hash])
@@ -219,7 +221,7 @@ def test_add_function_without_check_decorator(cli_runner, tmp_path):
     assert result.returncode == 0
 
     # Extract hash
-    func_hash = result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(result.stdout)
 
     # Verify metadata does NOT contain checks
     func_dir = cli_runner.pool_dir / func_hash[:2] / func_hash[2:]
@@ -11,13 +11,17 @@ from pathlib import Path
 import pytest
 
 import bb
-from tests.conftest import normalize_code_for_test
+from tests.conftest import normalize_code_for_test, stdout_extract_hash
 
 
 # Helper to run CLI commands
+# Resolved once at import: avoids Path arithmetic on every CLI call
+_BB_PY = str(Path(__file__).resolve().parents[2] / 'bb.py')
+
+
 def cli_run(args: list, env: dict = None, cwd: str = None) -> subprocess.CompletedProcess:
     """Run bb.py CLI command."""
-    cmd = [sys.executable, str(Path(__file__).parent.parent.parent / 'bb.py')] + args
+    cmd = [sys.executable, _BB_PY] + args
     return subprocess.run(cmd, capture_output=True, text=True, env=env, cwd=cwd)
 
 
@@ -80,12 +84,7 @@ def test_commit_copies_function_to_git_directory(tmp_path):
     assert add_result.returncode == 0
 
     # Extract hash from output
-    func_hash = None
-    for line in add_result.stdout.split('\n'):
-        if 'Hash:' in line:
-            func_hash = line.split('Hash:')[1].strip()
-            break
-    assert func_hash is not None
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Commit the function
     result = cli_run(['commit', func_hash, '--comment', 'Add hello function'], env=env)
@@ -124,11 +123,7 @@ def test_commit_copies_all_language_mappings(tmp_path):
     # Add both versions
     add_eng = cli_run(['add', f'{test_file_eng}@eng'], env=env)
     assert add_eng.returncode == 0
-    func_hash = None
-    for line in add_eng.stdout.split('\n'):
-        if 'Hash:' in line:
-            func_hash = line.split('Hash:')[1].strip()
-            break
+    func_hash = stdout_extract_hash(add_eng.stdout)
 
     add_fra = cli_run(['add', f'{test_file_fra}@fra'], env=env)
     assert add_fra.returncode == 0
@@ -161,11 +156,7 @@ def test_commit_copies_dependencies_recursively(tmp_path):
     # Add helper
     add_helper = cli_run(['add', f'{helper_file}@eng'], env=env)
     assert add_helper.returncode == 0
-    helper_hash = None
-    for line in add_helper.stdout.split('\n'):
-        if 'Hash:' in line:
-            helper_hash = line.split('Hash:')[1].strip()
-            break
+    helper_hash = stdout_extract_hash(add_helper.stdout)
 
     # Create main function that depends on helper
     main_file = tmp_path / 'main.py'
@@ -179,11 +170,7 @@ def main():
     # Add main
     add_main = cli_run(['add', f'{main_file}@eng'], env=env)
     assert add_main.returncode == 0
-    main_hash = None
-    for line in add_main.stdout.split('\n'):
-        if 'Hash:' in line:
-            main_hash = line.split('Hash:')[1].strip()
-            break
+    main_hash = stdout_extract_hash(add_main.stdout)
 
     # Commit the main function
     result = cli_run(['commit', main_hash, '--comment', 'Add main with dependency'], env=env)
@@ -213,11 +200,7 @@ def test_commit_initializes_git_repo(tmp_path):
 ''', encoding='utf-8')
 
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = None
-    for line in add_result.stdout.split('\n'):
-        if 'Hash:' in line:
-            func_hash = line.split('Hash:')[1].strip()
-            break
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Commit
     result = cli_run(['commit', func_hash, '--comment', 'Initial commit'], env=env)
@@ -243,11 +226,7 @@ def test_commit_creates_git_commit(tmp_path):
 ''', encoding='utf-8')
 
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = None
-    for line in add_result.stdout.split('\n'):
-        if 'Hash:' in line:
-            func_hash = line.split('Hash:')[1].strip()
-            break
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Commit with specific message
     commit_msg = 'Test commit message'
@@ -280,11 +259,7 @@ def test_commit_no_changes_when_already_committed(tmp_path):
 ''', encoding='utf-8')
 
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = None
-    for line in add_result.stdout.split('\n'):
-        if 'Hash:' in line:
-            func_hash = line.split('Hash:')[1].strip()
-            break
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # First commit
     cli_run(['commit', func_hash, '--comment', 'First commit'], env=env)
@@ -7,7 +7,12 @@ Integration tests for CLI compile command error handling.
 import pytest
 
 import bb
-from tests.conftest import normalize_code_for_test
+from tests.conftest import normalize_code_for_test, save_many
+
+# Shared hash constants: built once at import instead of per test body
+FAKE_HASH_A = 'a' * 64
+FAKE_HASH_F = 'f' * 64
+ZERO56 = '0' * 56
 
 
 # =============================================================================
@@ -16,7 +21,7 @@ from tests.conftest import normalize_code_for_test
 
 def test_compile_debug_without_language_fails(cli_runner):
     """Test that compile --debug fails without language suffix"""
-    result = cli_runner.run(['compile', '--debug', 'a' * 64])
+    result = cli_runner.run(['compile', '--debug', FAKE_HASH_A])
 
     assert result.returncode != 0
     assert '--debug requires language suffix' in result.stderr
@@ -32,7 +37,7 @@ def test_compile_invalid_hash_format_fails(cli_runner):
 
 def test_compile_nonexistent_function_fails(cli_runner):
     """Test that compile fails for nonexistent function"""
-    fake_hash = "f" * 64
+    fake_hash = FAKE_HASH_F
 
     result = cli_runner.run(['compile', f'{fake_hash}@eng'])
 
@@ -57,7 +62,7 @@ def test_compile_prepares_bundle(cli_runner, tmp_path):
 
 def test_compile_too_short_language_code_fails(cli_runner):
     """Test that compile fails with too short language code"""
-    result = cli_runner.run(['compile', 'a' * 64 + '@ab'])
+    result = cli_runner.run(['compile', FAKE_HASH_A + '@ab'])
 
     assert result.returncode != 0
     assert 'Language code must be 3-256 characters' in result.stderr
@@ -110,9 +115,9 @@ def _bb_v_0():
 # Unit tests for dependency resolution (complex low-level aspect)
 # =============================================================================
 
-def test_dependencies_resolve_no_deps(mock_bb_dir):
+def test_dependencies_resolve_no_deps(in_memory_pool):
     """Test resolving dependencies for function with no deps"""
-    func_hash = "nodeps01" + "0" * 56
+    func_hash = "nodeps01" + ZERO56
     normalized_code = normalize_code_for_test("def _bb_v_0(): return 42")
 
     bb.code_save(func_hash, "eng", normalized_code, "No deps", {"_bb_v_0": "answer"}, {})
@@ -122,22 +127,24 @@ def test_dependencies_resolve_no_deps(mock_bb_dir):
     assert deps == [func_hash]
 
 
-def test_dependencies_resolve_single_dep(mock_bb_dir):
+def test_dependencies_resolve_single_dep(in_memory_pool):
     """Test resolving single dependency"""
-    # Create dependency function
-    dep_hash = "helper01" + "0" * 56
+    # Create dependency function and the function that depends on it
+    dep_hash = "helper01" + ZERO56
     dep_code = normalize_code_for_test("def _bb_v_0(): return 10")
-    bb.code_save(dep_hash, "eng", dep_code, "Helper", {"_bb_v_0": "helper"}, {})
 
-    # Create function that depends on it
-    main_hash = "main0001" + "0" * 56
+    main_hash = "main0001" + ZERO56
     main_code = normalize_code_for_test(f"""
 from bb.pool import object_{dep_hash}
 
 def _bb_v_0():
     return object_{dep_hash}._bb_v_0() * 2
 """)
-    bb.code_save(main_hash, "eng", main_code, "Main", {"_bb_v_0": "double_helper"}, {dep_hash: "helper"})
+
+    save_many([
+        (dep_hash, "eng", dep_code, "Helper", {"_bb_v_0": "helper"}, {}),
+        (main_hash, "eng", main_code, "Main", {"_bb_v_0": "double_helper"}, {dep_hash: "helper"}),
+    ])
 
     deps = bb.code_resolve_dependencies(main_hash)
 
@@ -147,36 +154,33 @@ def _bb_v_0():
     assert deps[1] == main_hash  # main function last
 
 
-def test_dependencies_resolve_diamond(mock_bb_dir):
+def test_dependencies_resolve_diamond(in_memory_pool):
     """Test resolving diamond dependency pattern"""
     # A depends on B and C
     # B depends on D
     # C depends on D
     # Order should be: D, B, C, A (or D, C, B, A)
 
-    d_hash = "hashd001" + "0" * 56
+    d_hash = "hashd001" + ZERO56
     d_code = normalize_code_for_test("def _bb_v_0(): return 1")
-    bb.code_save(d_hash, "eng", d_code, "D", {"_bb_v_0": "d"}, {})
 
-    b_hash = "hashb001" + "0" * 56
+    b_hash = "hashb001" + ZERO56
     b_code = normalize_code_for_test(f"""
 from bb.pool import object_{d_hash}
 
 def _bb_v_0():
     return object_{d_hash}._bb_v_0() + 1
 """)
-    bb.code_save(b_hash, "eng", b_code, "B", {"_bb_v_0": "b"}, {d_hash: "d"})
 
-    c_hash = "hashc001" + "0" * 56
+    c_hash = "hashc001" + ZERO56
     c_code = normalize_code_for_test(f"""
 from bb.pool import object_{d_hash}
 
 def _bb_v_0():
     return object_{d_hash}._bb_v_0() * 2
 """)
-    bb.code_save(c_hash, "eng", c_code, "C", {"_bb_v_0": "c"}, {d_hash: "d"})
 
-    a_hash = "hasha001" + "0" * 56
+    a_hash = "hasha001" + ZERO56
     a_code = normalize_code_for_test(f"""
 from bb.pool import object_{b_hash}
 from bb.pool import object_{c_hash}
@@ -184,24 +188,32 @@ from bb.pool import object_{c_hash}
 def _bb_v_0():
     return object_{b_hash}._bb_v_0() + object_{c_hash}._bb_v_0()
 """)
-    bb.code_save(a_hash, "eng", a_code, "A", {"_bb_v_0": "a"}, {b_hash: "b", c_hash: "c"})
+
+    save_many([
+        (d_hash, "eng", d_code, "D", {"_bb_v_0": "d"}, {}),
+        (b_hash, "eng", b_code, "B", {"_bb_v_0": "b"}, {d_hash: "d"}),
+        (c_hash, "eng", c_code, "C", {"_bb_v_0": "c"}, {d_hash: "d"}),
+        (a_hash, "eng", a_code, "A", {"_bb_v_0": "a"}, {b_hash: "b", c_hash: "c"}),
+    ])
 
     deps = bb.code_resolve_dependencies(a_hash)
 
     # Should have all 4 hashes
     assert len(deps) == 4
+    # One positions dict instead of repeated O(N) deps.index() scans
+    position = {h: i for i, h in enumerate(deps)}
     # D should come before B and C
-    assert deps.index(d_hash) < deps.index(b_hash)
-    assert deps.index(d_hash) < deps.index(c_hash)
+    assert position[d_hash] < position[b_hash]
+    assert position[d_hash] < position[c_hash]
     # A should be last
     assert deps[-1] == a_hash
 
 
-def test_dependencies_resolve_missing_dependency_fails(mock_bb_dir):
+def test_dependencies_resolve_missing_dependency_fails(in_memory_pool):
     """Test that resolution fails when dependency doesn't exist"""
     # Create function that depends on nonexistent function
-    missing_hash = "missing0" + "0" * 56
-    main_hash = "main0002" + "0" * 56
+    missing_hash = "missing0" + ZERO56
+    main_hash = "main0002" + ZERO56
     main_code = normalize_code_for_test(f"""
 from bb.pool import object_{missing_hash}
 
@@ -216,11 +228,11 @@ def _bb_v_0():
     assert "not found" in str(exc_info.value).lower()
 
 
-def test_dependencies_resolve_circular_handled(mock_bb_dir):
+def test_dependencies_resolve_circular_handled(in_memory_pool):
     """Test that circular dependencies don't cause infinite loop"""
     # Create two functions that depend on each other
-    a_hash = "circlea0" + "0" * 56
-    b_hash = "circleb0" + "0" * 56
+    a_hash = "circlea0" + ZERO56
+    b_hash = "circleb0" + ZERO56
 
     # A depends on B
     a_code = normalize_code_for_test(f"""
@@ -256,7 +268,7 @@ def _bb_v_0():
 
 def test_dependencies_bundle(mock_bb_dir, tmp_path):
     """Test bundling functions to output directory"""
-    func_hash = "bundle01" + "0" * 56
+    func_hash = "bundle01" + ZERO56
     normalized_code = normalize_code_for_test("def _bb_v_0(): return 99")
     bb.code_save(func_hash, "eng", normalized_code, "Bundle test", {"_bb_v_0": "test"}, {})
 
@@ -297,7 +309,7 @@ def test_compile_get_nuitka_command_no_onefile():
 
 def test_compile_generate_runtime(tmp_path):
     """Test generating runtime module"""
-    func_hash = "runtime1" + "0" * 56
+    func_hash = "runtime1" + ZERO56
     runtime_dir = bb.compile_generate_runtime(func_hash, "eng", tmp_path)
 
     assert runtime_dir.exists()
@@ -387,7 +399,7 @@ def test_compile_python_mode_executable(cli_runner, tmp_path):
 
 def test_compile_generate_python(mock_bb_dir):
     """Test generating Python file content"""
-    func_hash = "pytest01" + "0" * 56
+    func_hash = "pytest01" + ZERO56
     normalized_code = normalize_code_for_test('''def _bb_v_0():
     """Test function"""
     return 123
@@ -429,7 +441,7 @@ def test_compile_recursive_function_no_debug(mock_bb_dir):
 
 def test_compile_recursive_function_debug_mode(mock_bb_dir):
     """Test compiling a recursive function with debug mode"""
-    func_hash = "recursdb" + "0" * 56
+    func_hash = "recursdb" + ZERO56
     # Recursive factorial function
     normalized_code = normalize_code_for_test('''def _bb_v_0(_bb_v_1):
     """Calculate factorial"""
@@ -11,8 +11,16 @@ Test Philosophy:
 - Unit tests only for complex low-level aspects (AST, hashing, schema, migration)
 """
 import ast
+import contextlib
+import copy
+import functools
+import io
+import os
+import re
+import shutil
 import subprocess
 import sys
+import traceback
 from pathlib import Path
 
 import pytest
@@ -20,7 +28,19 @@ import pytest
 # Add parent directory to path so we can import bb
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import bb
+
+@functools.lru_cache(maxsize=1)
+def bb_import():
+    """
+    Import bb on first use instead of at collection time.
+
+    Importing the whole module is the most expensive statement in this
+    conftest; subset runs that only exercise the CLI through subprocesses
+    (and pytest --collect-only) never need it.
+    """
+    import bb
+    return bb
+
 
 # Export fixtures and helpers
 __all__ = ['normalize_code_for_test', 'mock_bb_dir', 'sample_function_code',
@@ -37,11 +57,10 @@ def normalize_code_for_test(code: str) -> str:
     always outputs code with proper line breaks and indentation, regardless of
     the input format.
 
-    The function:
-    1. Parses code into AST
-    2. Clears all line/column information recursively (using bb.code_clear_locations)
-    3. Fixes missing locations
-    4. Unparses back to string
+    The function simply parses and unparses the code. Location info from
+    ast.parse does not affect ast.unparse output, so no clearing pass is
+    needed (and clearing alone would break unparse, which reads lineno
+    for type-comment lookup).
 
     Example:
         # Wrong - this format never exists in practice:
@@ -50,16 +69,138 @@ def normalize_code_for_test(code: str) -> str:
         # Correct - use this helper:
         normalized_code = normalize_code_for_test("def _bb_v_0(): return 42")
         # Returns: "def _bb_v_0():\\n    return 42"
+
+    The result is memoized: the function is pure and tests feed it the same
+    code strings many times over, so each unique input is parsed and
+    unparsed only once per session.
+    """
+    return _normalize_code_cached(code)
+
+
+@functools.lru_cache(maxsize=None)
+def _normalize_code_cached(code: str) -> str:
+    return ast.unparse(ast.parse(code))
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_frozen(code: str) -> ast.Module:
+    return ast.parse(code)
+
+
+def parse_for_test(code: str, mutable: bool = True) -> ast.Module:
+    """
+    Parse test source through a session-wide cache.
+
+    Tests parse the same handful of snippets over and over. The cached
+    tree is deep-copied by default because normalization mutates trees in
+    place; pass mutable=False for read-only use to skip the copy.
+    """
+    tree = _parse_frozen(code)
+    return copy.deepcopy(tree) if mutable else tree
+
+
+def save_many(rows):
+    """
+    Save several functions to the pool in one batch.
+
+    Each row is the positional argument tuple for bb.code_save:
+    (hash_value, lang, normalized_code, docstring, name_mapping,
+    alias_mapping). The pool backend is plain files, so batching here means
+    one stdout redirection and a single loop instead of per-call capture;
+    it also keeps call sites ready for a transactional backend.
+    """
+    bb = bb_import()
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink):
+        for row in rows:
+            bb.code_save(*row)
+
+
+# Resolved once at import: avoids Path arithmetic on every CLI call
+_BB_PY = str(Path(__file__).resolve().parent.parent / 'bb.py')
+
+# Compiled once: a single C-level regex scan of the output beats
+# splitting it into a line list and checking each line in Python
+_HASH_LINE = re.compile(r'Hash:\s*([0-9a-f]{64})')
+
+
+def stdout_extract_hash(stdout: str) -> str:
     """
-    tree = ast.parse(code)
-    bb.code_clear_locations(tree)
-    ast.fix_missing_locations(tree)
-    return ast.unparse(tree)
+    Extract the function hash from CLI 'Hash: ...' output.
+
+    One compiled-regex search over the output, instead of the ad-hoc split
+    chains previously duplicated across test files.
+    """
+    match = _HASH_LINE.search(stdout)
+    if match is None:
+        raise AssertionError(f"No 'Hash:' line in output: {stdout!r}")
+    return match.group(1)
+
+
+class _LazyTextResult:
+    """
+    CompletedProcess lookalike that decodes stdout/stderr on first access.
+
+    Many tests only inspect returncode; capturing bytes and decoding
+    lazily skips the UTF-8 decode of the full output for those.
+    """
+
+    def __init__(self, completed: subprocess.CompletedProcess):
+        self.args = completed.args
+        self.returncode = completed.returncode
+        self._raw_stdout = completed.stdout
+        self._raw_stderr = completed.stderr
+        self._stdout = None
+        self._stderr = None
+
+    @property
+    def stdout(self) -> str:
+        if self._stdout is None:
+            self._stdout = self._raw_stdout.decode('utf-8', 'replace')
+        return self._stdout
+
+    @property
+    def stderr(self) -> str:
+        if self._stderr is None:
+            self._stderr = self._raw_stderr.decode('utf-8', 'replace')
+        return self._stderr
+
+
+def cli_run_subprocess(args: list, env: dict = None, cwd: str = None) -> _LazyTextResult:
+    """
+    Run bb.py CLI command in a fresh interpreter.
+
+    Only use this when a test truly needs process isolation; cli_run is an
+    order of magnitude faster.
+    """
+    cmd = [sys.executable, _BB_PY] + args
+
+    run_env = os.environ.copy()
+    if env:
+        run_env.update(env)
+
+    completed = subprocess.run(
+        cmd,
+        capture_output=True,
+        env=run_env,
+        cwd=cwd
+    )
+    return _LazyTextResult(completed)
 
 
 def cli_run(args: list, env: dict = None, cwd: str = None) -> subprocess.CompletedProcess:
     """
-    Run bb.py CLI command.
+    Run bb.py CLI command in-process.
+
+    Calling bb.main() directly avoids spawning a Python interpreter per
+    command (~100-300ms of startup and imports each), which dominates the
+    wall time of the integration suite. stdout/stderr are captured through
+    StringIO, env and cwd are applied around the call and restored
+    afterwards, and sys.exit is translated into a returncode, so the result
+    is shaped exactly like subprocess.run output.
+
+    Set BB_TEST_SUBPROCESS=1 to fall back to spawning a real interpreter
+    for tests that need full process isolation.
 
     Args:
         args: Command arguments (without 'python bb.py' prefix)
@@ -74,20 +215,50 @@ def cli_run(args: list, env: dict = None, cwd: str = None) -> subprocess.Complet
         assert result.returncode == 0
         assert 'Hash:' in result.stdout
     """
-    import os
+    if os.environ.get('BB_TEST_SUBPROCESS'):
+        return cli_run_subprocess(args, env=env, cwd=cwd)
 
-    cmd = [sys.executable, str(Path(__file__).parent.parent / 'bb.py')] + args
+    bb = bb_import()
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    saved_environ = os.environ.copy()
+    saved_cwd = os.getcwd()
+    returncode = 0
 
-    run_env = os.environ.copy()
     if env:
-        run_env.update(env)
-
-    return subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        env=run_env,
-        cwd=cwd
+        os.environ.update(env)
+    if cwd:
+        os.chdir(cwd)
+
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                bb.main(args)
+            except SystemExit as exit_info:
+                code = exit_info.code
+                if code is None:
+                    returncode = 0
+                elif isinstance(code, int):
+                    returncode = code
+                else:
+                    # sys.exit("message") prints to stderr and exits 1
+                    print(code, file=stderr)
+                    returncode = 1
+            except Exception:
+                # A crash in a subprocess would surface as a traceback on
+                # stderr with a non-zero exit code; mirror that
+                traceback.print_exc(file=stderr)
+                returncode = 1
+    finally:
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_environ)
+
+    return subprocess.CompletedProcess(
+        args=args,
+        returncode=returncode,
+        stdout=stdout.getvalue(),
+        stderr=stderr.getvalue()
     )
 
 
@@ -117,10 +288,10 @@ class CLIRunner:
         if result.returncode != 0:
             raise RuntimeError(f"add failed: {result.stderr}")
         # Extract hash from output
-        for line in result.stdout.split('\n'):
-            if 'Hash:' in line:
-                return line.split('Hash:')[1].strip()
-        raise RuntimeError(f"Could not find hash in output: {result.stdout}")
+        match = _HASH_LINE.search(result.stdout)
+        if match is None:
+            raise RuntimeError(f"Could not find hash in output: {result.stdout}")
+        return match.group(1)
 
     def show(self, hash_lang: str) -> str:
         """Show a function and return its code."""
@@ -137,29 +308,97 @@ class CLIRunner:
         return result.stdout
 
 
+@pytest.fixture(scope='session')
+def worker_id():
+    """
+    pytest-xdist worker id, or 'master' when running single-process.
+
+    Defined locally so the suite does not depend on pytest-xdist being
+    installed; when it is, the plugin's own fixture (same value) wins.
+    """
+    return os.environ.get('PYTEST_XDIST_WORKER', 'master')
+
+
+@pytest.fixture(scope='module')
+def _bb_dir_module(tmp_path_factory, worker_id):
+    """
+    Module-scoped backing directory for mock_bb_dir.
+
+    Creating the temp directory once per module amortizes setup cost;
+    mock_bb_dir wipes the contents between tests so isolation is
+    unchanged.
+
+    The worker id is baked into the directory name so pool paths stay
+    unique per xdist worker (tmp_path_factory is already per-worker, this
+    makes it explicit); tests must not assume they run single-worker.
+    """
+    return tmp_path_factory.mktemp(f'bb-{worker_id}')
+
+
 @pytest.fixture
-def mock_bb_dir(tmp_path, monkeypatch):
+def mock_bb_dir(_bb_dir_module, monkeypatch):
     """
     Fixture to monkey patch directory functions to return a temp directory.
     This ensures tests work with pytest-xdist (parallel test runner).
 
+    The patch is applied per test (function-scoped monkeypatch) so tests
+    that do not request this fixture — cli_runner tests in the same
+    module, for example — keep resolving BB_DIRECTORY normally; only the
+    backing directory is shared across the module.
+
     Directory structure:
         tmp_path/.bb/
         ├── pool/          # Pool directory
         └── config.json    # Configuration file
     """
-    base_dir = tmp_path / '.bb'
-    pool_dir = base_dir / 'pool'
+    bb = bb_import()
+    bb_dir = _bb_dir_module / '.bb'
+    pool_dir = bb_dir / 'pool'
+
+    if bb_dir.exists():
+        shutil.rmtree(bb_dir)
+        # The wipe deletes pool files behind the read caches' back;
+        # saves will not see the stale entries otherwise
+        bb.storage_invalidate_caches()
+
+    monkeypatch.setattr(bb, 'storage_get_bb_directory', lambda: bb_dir)
+    monkeypatch.setattr(bb, 'storage_get_pool_directory', lambda: pool_dir)
+    return _bb_dir_module
+
+
+@pytest.fixture
+def in_memory_pool(monkeypatch):
+    """
+    Replace the pool backend with a plain dict for pure-logic tests.
+
+    Dependency-resolution tests only exercise the topological-sort
+    algorithm; they never look at the files the pool writes. Backing
+    code_save / code_detect_schema / code_load_v1 with a dict skips the
+    JSON serialization and file I/O entirely for those tests.
+
+    Yields the dict so tests can inspect or pre-seed it directly.
+    """
+    bb = bb_import()
+    pool = {}
+
+    def code_save(hash_value, lang, normalized_code, docstring,
+                  name_mapping, alias_mapping, comment=''):
+        pool[hash_value] = {
+            'schema_version': 1,
+            'hash': hash_value,
+            'normalized_code': normalized_code,
+        }
 
-    def _get_temp_bb_dir():
-        return base_dir
+    def code_detect_schema(func_hash):
+        return 1 if func_hash in pool else None
 
-    def _get_temp_pool_dir():
-        return pool_dir
+    def code_load_v1(hash_value):
+        return pool[hash_value]
 
-    monkeypatch.setattr(bb, 'storage_get_bb_directory', _get_temp_bb_dir)
-    monkeypatch.setattr(bb, 'storage_get_pool_directory', _get_temp_pool_dir)
-    return tmp_path
+    monkeypatch.setattr(bb, 'code_save', code_save)
+    monkeypatch.setattr(bb, 'code_detect_schema', code_detect_schema)
+    monkeypatch.setattr(bb, 'code_load_v1', code_load_v1)
+    return pool
 
 
 @pytest.fixture
@@ -4,52 +4,44 @@ Tests for 'bb.py init' command.
 Grey-box integration tests that verify CLI behavior and internal storage state.
 """
 import json
-import os
-import subprocess
-import sys
-from pathlib import Path
+import shutil
 
 import pytest
 
+from tests.conftest import cli_run
 
-def cli_run(args: list, env: dict = None, cwd: str = None) -> subprocess.CompletedProcess:
-    """Run bb.py CLI command."""
-    cmd = [sys.executable, str(Path(__file__).parent.parent.parent / 'bb.py')] + args
 
-    run_env = os.environ.copy()
-    if env:
-        run_env.update(env)
+@pytest.fixture(scope='session')
+def _initialized_bb_template(tmp_path_factory):
+    """
+    One canonical initialized bb directory, built once per session.
 
-    return subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        env=run_env,
-        cwd=cwd
-    )
+    Tests that only inspect post-init state copy this template instead of
+    re-running the init command.
+    """
+    template = tmp_path_factory.mktemp('init_template') / '.bb'
+    result = cli_run(['init'], env={'BB_DIRECTORY': str(template)})
+    assert result.returncode == 0
+    return template
 
 
-def test_init_creates_pool_directory(tmp_path):
-    """Test that init creates the pool directory structure."""
+@pytest.fixture
+def initialized_bb_dir(_initialized_bb_template, tmp_path):
+    """Per-test copy of the initialized template (copytree beats init)."""
     bb_dir = tmp_path / '.bb'
-    env = {'BB_DIRECTORY': str(bb_dir)}
+    shutil.copytree(_initialized_bb_template, bb_dir)
+    return bb_dir
 
-    result = cli_run(['init'], env=env)
 
-    assert result.returncode == 0
-    assert (bb_dir / 'pool').exists()
-    assert (bb_dir / 'pool').is_dir()
+def test_init_creates_pool_directory(initialized_bb_dir):
+    """Test that init creates the pool directory structure."""
+    assert (initialized_bb_dir / 'pool').exists()
+    assert (initialized_bb_dir / 'pool').is_dir()
 
 
-def test_init_creates_config_file(tmp_path):
+def test_init_creates_config_file(initialized_bb_dir):
     """Test that init creates config.json with correct structure."""
-    bb_dir = tmp_path / '.bb'
-    env = {'BB_DIRECTORY': str(bb_dir)}
-
-    result = cli_run(['init'], env=env)
-
-    assert result.returncode == 0
-    config_path = bb_dir / 'config.json'
+    config_path = initialized_bb_dir / 'config.json'
     assert config_path.exists()
 
     config = json.loads(config_path.read_text())
@@ -130,15 +122,9 @@ def test_init_idempotent(tmp_path):
     assert config1 == config2
 
 
-def test_init_creates_empty_remotes(tmp_path):
+def test_init_creates_empty_remotes(initialized_bb_dir):
     """Test that init creates empty remotes dict."""
-    bb_dir = tmp_path / '.bb'
-    env = {'BB_DIRECTORY': str(bb_dir)}
-
-    result = cli_run(['init'], env=env)
-
-    assert result.returncode == 0
-    config = json.loads((bb_dir / 'config.json').read_text())
+    config = json.loads((initialized_bb_dir / 'config.json').read_text())
     assert config['remotes'] == {}
 
 
@@ -11,10 +11,16 @@ from pathlib import Path
 
 import pytest
 
+from tests.conftest import stdout_extract_hash
+
+
+# Resolved once at import: avoids Path arithmetic on every CLI call
+_BB_PY = str(Path(__file__).resolve().parents[2] / 'bb.py')
+
 
 def cli_run(args: list, env: dict = None) -> subprocess.CompletedProcess:
     """Run bb.py CLI command."""
-    cmd = [sys.executable, str(Path(__file__).parent.parent.parent / 'bb.py')] + args
+    cmd = [sys.executable, _BB_PY] + args
 
     run_env = os.environ.copy()
     if env:
@@ -60,7 +66,7 @@ def test_log_displays_function_info(tmp_path):
     test_file = tmp_path / "func.py"
     test_file.write_text('def foo(): pass')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test
     result = cli_run(['log'], env=env)
@@ -12,10 +12,16 @@ from pathlib import Path
 
 import pytest
 
+from tests.conftest import stdout_extract_hash
+
+
+# Resolved once at import: avoids Path arithmetic on every CLI call
+_BB_PY = str(Path(__file__).resolve().parents[2] / 'bb.py')
+
 
 def cli_run(args: list, env: dict = None, input_text: str = None) -> subprocess.CompletedProcess:
     """Run bb.py CLI command with optional stdin input."""
-    cmd = [sys.executable, str(Path(__file__).parent.parent.parent / 'bb.py')] + args
+    cmd = [sys.executable, _BB_PY] + args
 
     run_env = os.environ.copy()
     if env:
@@ -67,7 +73,7 @@ def test_review_displays_function_code(tmp_path):
     return data * 2
 ''')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test - provide 'y' to approve the function
     result = cli_run(['review', func_hash], env=env, input_text='y\n')
@@ -90,7 +96,7 @@ def test_review_shows_function_review_header(tmp_path):
     test_file = tmp_path / "func.py"
     test_file.write_text('def foo(): pass')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test - provide 'y' to approve
     result = cli_run(['review', func_hash], env=env, input_text='y\n')
@@ -116,7 +122,7 @@ def test_review_uses_preferred_language(tmp_path):
     return valeur * 2
 ''')
     add_result = cli_run(['add', f'{test_file}@fra'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test - provide 'y' to approve
     result = cli_run(['review', func_hash], env=env, input_text='y\n')
@@ -140,7 +146,7 @@ def test_review_fallback_when_language_unavailable(tmp_path):
     test_file = tmp_path / "func.py"
     test_file.write_text('def foo(): pass')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test - run will exit early due to no matching language
     result = cli_run(['review', func_hash], env=env, input_text='y\n')
@@ -158,7 +164,7 @@ def test_review_default_language_fallback(tmp_path):
     test_file = tmp_path / "func.py"
     test_file.write_text('def foo(): pass')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test: Review without init (config doesn't exist) - provide 'y'
     result = cli_run(['review', func_hash], env=env, input_text='y\n')
@@ -178,7 +184,7 @@ def test_review_saves_state(tmp_path):
     test_file = tmp_path / "func.py"
     test_file.write_text('def bar(): pass')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test - approve the function
     result = cli_run(['review', func_hash], env=env, input_text='y\n')
@@ -205,7 +211,7 @@ def test_review_skips_already_reviewed(tmp_path):
     test_file = tmp_path / "func.py"
     test_file.write_text('def baz(): pass')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # First review - approve
     cli_run(['review', func_hash], env=env, input_text='y\n')
@@ -228,7 +234,7 @@ def test_review_quit_saves_progress(tmp_path):
     test_file = tmp_path / "func.py"
     test_file.write_text('def qux(): pass')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test - quit without approving
     result = cli_run(['review', func_hash], env=env, input_text='q\n')
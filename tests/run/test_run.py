@@ -3,44 +3,46 @@ Tests for 'bb.py run' command.
 
 Grey-box integration tests for function execution.
 """
-import json
-import os
-import subprocess
-import sys
-from pathlib import Path
-
 import pytest
 
+from tests.conftest import cli_run, stdout_extract_hash
 
-def cli_run(args: list, env: dict = None) -> subprocess.CompletedProcess:
-    """Run bb.py CLI command."""
-    cmd = [sys.executable, str(Path(__file__).parent.parent.parent / 'bb.py')] + args
-
-    run_env = os.environ.copy()
-    if env:
-        run_env.update(env)
 
-    return subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        env=run_env
-    )
+GREET_SRC = '''def greet(name):
+    """Greet someone"""
+    return f"Hello, {name}!"
+'''
 
 
-def test_run_without_language_works(tmp_path):
-    """Test that run works without language suffix when function exists"""
+@pytest.fixture
+def empty_pool_env(tmp_path):
+    """Env pointing at a bb directory with an existing empty pool."""
     bb_dir = tmp_path / '.bb'
-    env = {'BB_DIRECTORY': str(bb_dir)}
+    (bb_dir / 'pool').mkdir(parents=True)
+    return {'BB_DIRECTORY': str(bb_dir)}
+
+
+@pytest.fixture(scope='module')
+def greet_hash(tmp_path_factory):
+    """
+    Pool with the greet function added once, shared across the module.
+
+    The run command only reads the pool, so the tests that exercise it
+    against greet can share one add instead of re-adding per test.
+    Yields (function hash, env pointing at the shared pool).
+    """
+    base = tmp_path_factory.mktemp('run')
+    env = {'BB_DIRECTORY': str(base / '.bb')}
+    test_file = base / 'func.py'
+    test_file.write_text(GREET_SRC)
+    result = cli_run(['add', f'{test_file}@eng'], env=env)
+    assert result.returncode == 0
+    return stdout_extract_hash(result.stdout), env
 
-    # Setup: Add a function first
-    test_file = tmp_path / "func.py"
-    test_file.write_text('''def greet(name):
-    """Greet someone"""
-    return f"Hello, {name}!"
-''')
-    add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+
+def test_run_without_language_works(greet_hash):
+    """Test that run works without language suffix when function exists"""
+    func_hash, env = greet_hash
 
     # Test: Run without @lang
     result = cli_run(['run', func_hash, '--', 'World'], env=env)
@@ -50,32 +52,18 @@ def test_run_without_language_works(tmp_path):
     assert 'Hello, World!' in result.stdout
 
 
-def test_run_without_language_nonexistent_fails(tmp_path):
+def test_run_without_language_nonexistent_fails(empty_pool_env):
     """Test that run fails without language suffix when function doesn't exist"""
-    bb_dir = tmp_path / '.bb'
-    (bb_dir / 'pool').mkdir(parents=True)
-    env = {'BB_DIRECTORY': str(bb_dir)}
-
     fake_hash = '0' * 64
-    result = cli_run(['run', fake_hash], env=env)
+    result = cli_run(['run', fake_hash], env=empty_pool_env)
 
     assert result.returncode != 0
     assert 'No language mappings found' in result.stderr
 
 
-def test_run_debug_requires_language(tmp_path):
+def test_run_debug_requires_language(greet_hash):
     """Test that run --debug requires language suffix"""
-    bb_dir = tmp_path / '.bb'
-    env = {'BB_DIRECTORY': str(bb_dir)}
-
-    # Setup: Add a function first
-    test_file = tmp_path / "func.py"
-    test_file.write_text('''def greet(name):
-    """Greet someone"""
-    return f"Hello, {name}!"
-''')
-    add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash, env = greet_hash
 
     # Test: Run --debug without @lang
     result = cli_run(['run', '--debug', func_hash], env=env)
@@ -108,32 +96,18 @@ def test_run_invalid_hash_fails(tmp_path):
     assert 'Invalid hash format' in result.stderr
 
 
-def test_run_nonexistent_function_fails(tmp_path):
+def test_run_nonexistent_function_fails(empty_pool_env):
     """Test that run fails for nonexistent function"""
-    bb_dir = tmp_path / '.bb'
-    (bb_dir / 'pool').mkdir(parents=True)
-    env = {'BB_DIRECTORY': str(bb_dir)}
-
     fake_hash = 'f' * 64
-    result = cli_run(['run', f'{fake_hash}@eng'], env=env)
+    result = cli_run(['run', f'{fake_hash}@eng'], env=empty_pool_env)
 
     assert result.returncode != 0
     assert 'Could not load function' in result.stderr or 'not found' in result.stderr.lower()
 
 
-def test_run_with_string_argument(tmp_path):
+def test_run_with_string_argument(greet_hash):
     """Test running function with string argument"""
-    bb_dir = tmp_path / '.bb'
-    env = {'BB_DIRECTORY': str(bb_dir)}
-
-    # Setup
-    test_file = tmp_path / "func.py"
-    test_file.write_text('''def greet(name):
-    """Greet someone"""
-    return f"Hello, {name}!"
-''')
-    add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash, env = greet_hash
 
     # Test - arguments are passed as strings, no implicit coercion
     result = cli_run(['run', f'{func_hash}@eng', '--', 'World'], env=env)
@@ -155,7 +129,7 @@ def test_run_with_multiple_string_arguments(tmp_path):
     return a + b
 ''')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test - arguments passed as strings
     result = cli_run(['run', f'{func_hash}@eng', '--', 'Hello', 'World'], env=env)
@@ -177,7 +151,7 @@ def test_run_displays_function_code(tmp_path):
     return value + 1
 ''')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test
     result = cli_run(['run', f'{func_hash}@eng', '--', '10'], env=env)
@@ -200,7 +174,7 @@ def test_run_function_with_exception(tmp_path):
     return a / b
 ''')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test: Division by zero
     result = cli_run(['run', f'{func_hash}@eng', '--', '10', '0'], env=env)
@@ -10,10 +10,16 @@ from pathlib import Path
 
 import pytest
 
+from tests.conftest import stdout_extract_hash
+
+
+# Resolved once at import: avoids Path arithmetic on every CLI call
+_BB_PY = str(Path(__file__).resolve().parents[2] / 'bb.py')
+
 
 def cli_run(args: list, env: dict = None) -> subprocess.CompletedProcess:
     """Run bb.py CLI command."""
-    cmd = [sys.executable, str(Path(__file__).parent.parent.parent / 'bb.py')] + args
+    cmd = [sys.executable, _BB_PY] + args
 
     run_env = os.environ.copy()
     if env:
@@ -143,7 +149,7 @@ def test_search_shows_view_command(tmp_path):
     pass
 ''')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test
     result = cli_run(['search', 'searchable'], env=env)
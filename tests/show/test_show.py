@@ -6,6 +6,7 @@ Grey-box style:
 - Test: Call 'show' command via CLI
 - Assert: Check output contains expected code
 """
+from tests.conftest import stdout_extract_hash
 
 
 def test_show_displays_denormalized_code(cli_runner, tmp_path):
@@ -206,7 +207,7 @@ def test_show_multiple_mappings_shows_menu(cli_runner, tmp_path):
     assert result2.returncode == 0
 
     # Extract hash
-    func_hash = result1.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(result1.stdout)
 
     # Test: Show function with multiple mappings
     result = cli_runner.run(['show', f'{func_hash}@eng'])
@@ -229,7 +230,7 @@ def test_show_explicit_mapping_hash(cli_runner, tmp_path):
 
     # Add with comment
     result1 = cli_runner.run(['add', f'{test_file}@eng', '--comment', 'target version'])
-    func_hash = result1.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(result1.stdout)
     mapping_hash = result1.stdout.split('Mapping hash:')[1].strip().split()[0]
 
     # Test: Show with explicit mapping hash
@@ -70,77 +70,27 @@ def test_bytes_write_read_unicode():
 # Tests for order preservation
 # ============================================================================
 
-def test_bytes_write_order_strings():
-    """Test that encoded strings preserve lexicographic order"""
-    values = [('apple',), ('banana',), ('cherry',)]
-    encoded = [bytes_write(v) for v in values]
-
-    # Encoded values should maintain order
-    assert encoded[0] < encoded[1] < encoded[2]
-
-
-def test_bytes_write_order_integers():
-    """Test that encoded integers preserve numeric order"""
-    values = [(1,), (42,), (100,), (1000,)]
-    encoded = [bytes_write(v) for v in values]
-
-    # Encoded values should maintain order
-    assert encoded[0] < encoded[1] < encoded[2] < encoded[3]
-
-
-def test_bytes_write_order_negative_integers():
-    """Test that encoded negative integers preserve order among themselves"""
-    # Note: Current encoding has negative ints type code (0x06) > zero type code (0x04),
-    # so negative integers sort after zero. Test only negative number ordering.
-    values = [(-100,), (-42,), (-1,)]
-    encoded = [bytes_write(v) for v in values]
-
-    # Encoded negative values should maintain order among themselves
-    for i in range(len(encoded) - 1):
-        assert encoded[i] < encoded[i + 1]
-
-    # Test positive integers separately
-    pos_values = [(0,), (1,), (42,), (100,)]
-    pos_encoded = [bytes_write(v) for v in pos_values]
-
-    for i in range(len(pos_encoded) - 1):
-        assert pos_encoded[i] < pos_encoded[i + 1]
-
-
-def test_bytes_write_order_floats():
-    """Test that encoded floats preserve numeric order"""
-    values = [(0.1,), (1.5,), (3.14,), (10.0,)]
-    encoded = [bytes_write(v) for v in values]
-
-    # Encoded values should maintain order
-    assert encoded[0] < encoded[1] < encoded[2] < encoded[3]
-
-
-def test_bytes_write_order_mixed_tuples():
-    """Test order preservation with mixed-type tuples"""
-    values = [
-        ('user', 'age', 20),
-        ('user', 'age', 30),
-        ('user', 'age', 40),
-    ]
-    encoded = [bytes_write(v) for v in values]
-
-    # Encoded values should maintain order
-    assert encoded[0] < encoded[1] < encoded[2]
-
-
-def test_bytes_write_order_prefix_matching():
-    """Test order preservation with common prefixes"""
-    values = [
-        ('blog', 'post', 'a'),
-        ('blog', 'post', 'b'),
-        ('blog', 'post', 'c'),
-        ('blog', 'title', 'x'),
-    ]
-    encoded = [bytes_write(v) for v in values]
-
-    # Encoded values should maintain order
-    assert encoded[0] < encoded[1] < encoded[2] < encoded[3]
+# Note: negative ints type code (0x06) > zero type code (0x04), so negative
+# integers sort after zero; negatives and positives are checked separately
+@pytest.mark.parametrize('values', [
+    [('apple',), ('banana',), ('cherry',)],
+    [(1,), (42,), (100,), (1000,)],
+    [(-100,), (-42,), (-1,)],
+    [(0,), (1,), (42,), (100,)],
+    [(0.1,), (1.5,), (3.14,), (10.0,)],
+    [('user', 'age', 20), ('user', 'age', 30), ('user', 'age', 40)],
+    [('blog', 'post', 'a'), ('blog', 'post', 'b'), ('blog', 'post', 'c'),
+     ('blog', 'title', 'x')],
+], ids=['strings', 'integers', 'negative_integers', 'positive_integers',
+        'floats', 'mixed_tuples', 'prefix_matching'])
+def test_bytes_write_preserves_order(values):
+    """Test that encoding preserves the natural order of the input tuples"""
+    encoded = list(map(bytes_write, values))
+
+    # Sorted and all-distinct together give the strict ordering the
+    # previous chained < assertions checked
+    assert encoded == sorted(encoded)
+    assert len(set(encoded)) == len(encoded)
 
 
 # ============================================================================
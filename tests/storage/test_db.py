@@ -32,13 +32,14 @@ def test_db_open_file(tmp_path):
     assert db_path.exists()
 
 
-def test_db_open_creates_index():
-    """Test that db_open creates index on key column"""
+def test_db_open_key_lookups_use_index():
+    """Test that key lookups are backed by the primary key index"""
     db = db_open(':memory:')
 
-    # Verify index exists
-    cursor = db.execute("SELECT name FROM sqlite_master WHERE type='index' AND name='idx_key'")
-    assert cursor.fetchone() is not None
+    # The BLOB PRIMARY KEY provides the index; no table scan expected
+    cursor = db.execute("EXPLAIN QUERY PLAN SELECT value FROM kv WHERE key = ?", (b'k',))
+    plan = ' '.join(str(row) for row in cursor.fetchall())
+    assert 'SCAN' not in plan
 
 
 # ============================================================================
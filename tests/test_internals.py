@@ -25,59 +25,55 @@ from tests.conftest import normalize_code_for_test
 
 
 # ============================================================================
-# Tests for ASTNormalizer class
+# Tests for code_rename_names function
 # ============================================================================
 
-def test_ast_normalizer_visit_name_with_mapping():
+def test_code_rename_names_name_with_mapping():
     """Test that Name nodes are renamed according to mapping"""
     mapping = {"x": "_bb_v_1", "y": "_bb_v_2"}
-    normalizer = bb.ASTNormalizer(mapping)
 
     code = "z = x + y"
     tree = ast.parse(code)
-    normalizer.visit(tree)
+    bb.code_rename_names(tree, mapping)
     result = ast.unparse(tree)
 
     assert "_bb_v_1" in result
     assert "_bb_v_2" in result
 
 
-def test_ast_normalizer_visit_name_without_mapping():
+def test_code_rename_names_name_without_mapping():
     """Test that unmapped names remain unchanged"""
     mapping = {"x": "_bb_v_1"}
-    normalizer = bb.ASTNormalizer(mapping)
 
     code = "z = x + y"
     tree = ast.parse(code)
-    normalizer.visit(tree)
+    bb.code_rename_names(tree, mapping)
     result = ast.unparse(tree)
 
     assert "_bb_v_1" in result
     assert "y" in result  # y should remain unchanged
 
 
-def test_ast_normalizer_visit_arg_with_mapping():
+def test_code_rename_names_arg_with_mapping():
     """Test that function arguments are renamed"""
     mapping = {"x": "_bb_v_1", "y": "_bb_v_2"}
-    normalizer = bb.ASTNormalizer(mapping)
 
     code = "def foo(x, y): return x + y"
     tree = ast.parse(code)
-    normalizer.visit(tree)
+    bb.code_rename_names(tree, mapping)
     result = ast.unparse(tree)
 
     assert "_bb_v_1" in result
     assert "_bb_v_2" in result
 
 
-def test_ast_normalizer_visit_functiondef_with_mapping():
+def test_code_rename_names_functiondef_with_mapping():
     """Test that function names are renamed"""
     mapping = {"foo": "_bb_v_0"}
-    normalizer = bb.ASTNormalizer(mapping)
 
     code = "def foo(): pass"
     tree = ast.parse(code)
-    normalizer.visit(tree)
+    bb.code_rename_names(tree, mapping)
     result = ast.unparse(tree)
 
     assert "_bb_v_0" in result
@@ -118,6 +114,32 @@ def test_collect_names_empty_tree():
     assert len(names) == 0
 
 
+# ============================================================================
+# Tests for code_scan function
+# ============================================================================
+
+def test_code_scan_single_pass_collects_all():
+    """Test that one scan yields names, imports and references together"""
+    code = "import math\ndef foo(a):\n    return math.sqrt(a)"
+    tree = ast.parse(code)
+    result = bb.code_scan(tree)
+
+    assert "foo" in result.names
+    assert "a" in result.names
+    assert "math" in result.imported
+    assert "math" in result.referenced
+
+
+def test_code_scan_referenced_excludes_import_bindings():
+    """Test that unreferenced imports do not appear in referenced"""
+    code = "import math\nx = 1"
+    tree = ast.parse(code)
+    result = bb.code_scan(tree)
+
+    assert "math" in result.imported
+    assert "math" not in result.referenced
+
+
 # ============================================================================
 # Tests for imports_get_names function
 # ============================================================================
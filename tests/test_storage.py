@@ -10,6 +10,11 @@ import pytest
 import bb
 from tests.conftest import normalize_code_for_test
 
+# The most common fixture code string, normalized once at import;
+# normalize_code_for_test is memoized but a constant reads better at the
+# many call sites that share it
+PASS_CODE = normalize_code_for_test("def _bb_v_0(): pass")
+
 
 # ============================================================================
 # Tests for V1 Write Path
@@ -18,7 +23,7 @@ from tests.conftest import normalize_code_for_test
 def test_function_save_v1_creates_object_json(mock_bb_dir):
     """Test that function_save_v1 creates proper object.json"""
     test_hash = "abcd1234" + "0" * 56
-    normalized_code = normalize_code_for_test("def _bb_v_0(): pass")
+    normalized_code = PASS_CODE
     metadata = {
         'created': '2025-01-01T00:00:00Z',
         'name': 'testuser',
@@ -47,7 +52,7 @@ def test_function_save_v1_creates_object_json(mock_bb_dir):
 def test_function_save_v1_no_language_data(mock_bb_dir):
     """Test that function_save_v1 does NOT include language-specific data"""
     test_hash = "abcd1234" + "0" * 56
-    normalized_code = normalize_code_for_test("def _bb_v_0(): pass")
+    normalized_code = PASS_CODE
     metadata = bb.code_create_metadata()
 
     bb.code_save_v1(test_hash, normalized_code, metadata)
@@ -75,7 +80,7 @@ def test_mapping_save_v1_creates_mapping_json(mock_bb_dir):
     comment = "Test variant"
 
     # First create the function (object.json must exist)
-    normalized_code = normalize_code_for_test("def _bb_v_0(): pass")
+    normalized_code = PASS_CODE
     metadata = bb.code_create_metadata()
     bb.code_save_v1(func_hash, normalized_code, metadata)
 
@@ -110,7 +115,7 @@ def test_mapping_save_v1_returns_hash(mock_bb_dir):
     comment = ""
 
     # Create function first
-    bb.code_save_v1(func_hash, normalize_code_for_test("def _bb_v_0(): pass"), bb.code_create_metadata())
+    bb.code_save_v1(func_hash, PASS_CODE, bb.code_create_metadata())
 
     # Save mapping
     mapping_hash = bb.mapping_save_v1(func_hash, lang, docstring, name_mapping, alias_mapping, comment)
@@ -135,7 +140,7 @@ def test_mapping_save_v1_deduplication(mock_bb_dir):
     comment = "Same comment"
 
     # Create two different functions
-    bb.code_save_v1(func_hash1, normalize_code_for_test("def _bb_v_0(): pass"), bb.code_create_metadata())
+    bb.code_save_v1(func_hash1, PASS_CODE, bb.code_create_metadata())
     bb.code_save_v1(func_hash2, normalize_code_for_test("def _bb_v_0(): return 42"), bb.code_create_metadata())
 
     # Save identical mappings for both
@@ -155,7 +160,7 @@ def test_mapping_save_v1_different_comments_different_hashes(mock_bb_dir):
     alias_mapping = {}
 
     # Create function
-    bb.code_save_v1(func_hash, normalize_code_for_test("def _bb_v_0(): pass"), bb.code_create_metadata())
+    bb.code_save_v1(func_hash, PASS_CODE, bb.code_create_metadata())
 
     # Save two mappings with different comments
     hash1 = bb.mapping_save_v1(func_hash, lang, docstring, name_mapping, alias_mapping, "Formal")
@@ -252,7 +257,7 @@ def test_mappings_list_v1_single_mapping(mock_bb_dir):
     comment = "Test variant"
 
     # Create function and mapping
-    bb.code_save_v1(func_hash, normalize_code_for_test("def _bb_v_0(): pass"), bb.code_create_metadata())
+    bb.code_save_v1(func_hash, PASS_CODE, bb.code_create_metadata())
     bb.mapping_save_v1(func_hash, lang, docstring, name_mapping, alias_mapping, comment)
 
     # List mappings
@@ -271,7 +276,7 @@ def test_mappings_list_v1_multiple_mappings(mock_bb_dir):
     lang = "eng"
 
     # Create function
-    bb.code_save_v1(func_hash, normalize_code_for_test("def _bb_v_0(): pass"), bb.code_create_metadata())
+    bb.code_save_v1(func_hash, PASS_CODE, bb.code_create_metadata())
 
     # Add two mappings with different comments
     bb.mapping_save_v1(func_hash, lang, "Doc 1", {"_bb_v_0": "func1"}, {}, "Formal")
@@ -294,7 +299,7 @@ def test_mappings_list_v1_no_mappings(mock_bb_dir):
     func_hash = "nomaps12" + "0" * 56
 
     # Create function without any mappings
-    bb.code_save_v1(func_hash, normalize_code_for_test("def _bb_v_0(): pass"), bb.code_create_metadata())
+    bb.code_save_v1(func_hash, PASS_CODE, bb.code_create_metadata())
 
     # List mappings for a language that doesn't exist
     mappings = bb.mappings_list_v1(func_hash, "fra")
@@ -313,7 +318,7 @@ def test_mapping_load_v1_loads_correctly(mock_bb_dir):
     comment = "Test variant"
 
     # Create function and mapping
-    bb.code_save_v1(func_hash, normalize_code_for_test("def _bb_v_0(): pass"), bb.code_create_metadata())
+    bb.code_save_v1(func_hash, PASS_CODE, bb.code_create_metadata())
     mapping_hash = bb.mapping_save_v1(func_hash, lang, docstring, name_mapping, alias_mapping, comment)
 
     # Load the mapping
@@ -353,7 +358,7 @@ def test_function_load_dispatch_multiple_mappings(mock_bb_dir):
     """Test that dispatch with multiple mappings defaults to first one"""
     func_hash = "multi123" + "0" * 56
     lang = "eng"
-    normalized_code = normalize_code_for_test("def _bb_v_0(): pass")
+    normalized_code = PASS_CODE
 
     # Create function with two mappings
     bb.code_save_v1(func_hash, normalized_code, bb.code_create_metadata())
@@ -373,7 +378,7 @@ def test_function_load_dispatch_explicit_mapping(mock_bb_dir):
     """Test that dispatch can load specific mapping by hash"""
     func_hash = "explicit1" + "0" * 56
     lang = "eng"
-    normalized_code = normalize_code_for_test("def _bb_v_0(): pass")
+    normalized_code = PASS_CODE
 
     # Create function with two mappings
     bb.code_save_v1(func_hash, normalized_code, bb.code_create_metadata())
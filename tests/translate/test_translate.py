@@ -12,10 +12,16 @@ from pathlib import Path
 
 import pytest
 
+from tests.conftest import stdout_extract_hash
+
+
+# Resolved once at import: avoids Path arithmetic on every CLI call
+_BB_PY = str(Path(__file__).resolve().parents[2] / 'bb.py')
+
 
 def cli_run(args: list, env: dict = None, input_text: str = None) -> subprocess.CompletedProcess:
     """Run bb.py CLI command with optional stdin input."""
-    cmd = [sys.executable, str(Path(__file__).parent.parent.parent / 'bb.py')] + args
+    cmd = [sys.executable, _BB_PY] + args
 
     run_env = os.environ.copy()
     if env:
@@ -39,7 +45,7 @@ def test_translate_missing_source_language_fails(tmp_path):
     test_file = tmp_path / "func.py"
     test_file.write_text('def foo(): pass')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test: translate without @lang
     result = cli_run(['translate', func_hash, 'fra'], env=env)
@@ -72,7 +78,7 @@ def test_translate_invalid_target_language_fails(tmp_path):
     test_file = tmp_path / "func.py"
     test_file.write_text('def foo(): pass')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test with too short language code (must be 3-256 chars)
     result = cli_run(['translate', f'{func_hash}@eng', 'ab'], env=env)
@@ -118,7 +124,7 @@ def test_translate_shows_source_function(tmp_path):
     return f"Hello, {name}!"
 ''')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test: Provide interactive input (will fail on empty input but we can check output)
     # Provide translations: function name, variable name, docstring, comment
@@ -142,7 +148,7 @@ def test_translate_creates_mapping(tmp_path):
     return f"Hello, {name}!"
 ''')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test: Provide translations for both names
     # _bb_v_0 = greet, _bb_v_1 = name
@@ -171,7 +177,7 @@ def test_translate_prompts_for_all_names(tmp_path):
     return result
 ''')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test: Provide translations for all names
     # 4 names: function + 3 variables
@@ -4,30 +4,10 @@ Tests for 'bb.py validate' command.
 Grey-box integration tests for function validation.
 """
 import json
-import os
-import subprocess
-import sys
-from pathlib import Path
 
 import pytest
 
-from tests.conftest import normalize_code_for_test
-
-
-def cli_run(args: list, env: dict = None) -> subprocess.CompletedProcess:
-    """Run bb.py CLI command."""
-    cmd = [sys.executable, str(Path(__file__).parent.parent.parent / 'bb.py')] + args
-
-    run_env = os.environ.copy()
-    if env:
-        run_env.update(env)
-
-    return subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        env=run_env
-    )
+from tests.conftest import cli_run, normalize_code_for_test, stdout_extract_hash
 
 
 def test_validate_valid_function(tmp_path):
@@ -39,7 +19,7 @@ def test_validate_valid_function(tmp_path):
     test_file = tmp_path / "func.py"
     test_file.write_text('def foo(): pass')
     add_result = cli_run(['add', f'{test_file}@eng'], env=env)
-    func_hash = add_result.stdout.split('Hash:')[1].strip().split()[0]
+    func_hash = stdout_extract_hash(add_result.stdout)
 
     # Test
     result = cli_run(['validate', func_hash], env=env)